@@ -0,0 +1,108 @@
+"""
+Description: Best moves of many racks on the same board.
+Every placement of a lexicon word in the slots of the board is found once, without a rack, and filed under
+the letters it takes from the rack, keeping only the best placement of every set of letters. The best move
+of a rack is then the best placement filed under the sets of letters the rack holds, which are at most 128
+for a rack of 7 tiles, so that a rack costs a few lookups instead of a search of the lexicon.
+"""
+
+import collections
+import itertools
+
+import movegen
+
+class BatchEvaluator:
+    """
+    Placements of one board for racks of up to a given number of tiles, by the letters they take from the rack.
+    The board must not change while the evaluator is used.
+    """
+
+    def __init__(self, board, firstMove, words, scores, index, slotIndex, reach):
+        """
+        :param board: Board as a list of rows of letters, "" for empty cells.
+
+        :param firstMove: Boolean of whether the racks are played for the first move.
+
+        :param words: Lexicon of the valid words.
+
+        :param scores: A map with letters as keys and scores as values.
+
+        :param index: BoardIndex of the board.
+
+        :param slotIndex: board.SlotIndex of the board, updated for the number of tiles of the largest rack.
+
+        :param reach: Number of tiles of the largest rack.
+        """
+        self.reach = reach
+        self.best = {}          # A map with the sorted letters taken from the rack as keys and best Moves as values
+        self.placements = 0     # Number of legal placements found
+
+        # The first move is only played from the first cell, with letters of the rack only
+        if firstMove:
+            for wordIndex in words.indexesOfLengths(range(1, min(len(board), reach) + 1)):
+                word = words.words[wordIndex]
+                self.add("".join(sorted(word)), movegen.Move(word, 0, 0, movegen.HORIZONTAL,
+                                                             sum(scores[letter] for letter in word)))
+            return
+
+        slotIndex.update(board, index, reach)
+        for wordIndex in words.indexesOfLengths(list(slotIndex.lengths)):
+            word = words.words[wordIndex]
+            # Slots fit on the board and hold both tiles and empty cells, only the tiles are checked
+            for row, col, direction in slotIndex.slotsOf(word):
+                needed = []
+                for k in range(len(word)):
+                    cell = board[row][col + k] if direction == movegen.HORIZONTAL else board[row + k][col]
+                    if not cell:
+                        needed.append(word[k])
+                    elif cell != word[k]:
+                        break
+                else:
+                    self.add("".join(sorted(needed)), movegen.Move(word, row, col, direction,
+                                                                   sum(scores[letter] for letter in needed)))
+
+    def add(self, letters, move):
+        """
+        Files a legal placement under the letters it takes from the rack, unless a better one is filed there.
+
+        :param letters: Sorted letters taken from the rack.
+
+        :param move: Move of the placement.
+        """
+        self.placements += 1
+        best = self.best.get(letters)
+        if best is None or movegen.moveKey(move) < movegen.moveKey(best):
+            self.best[letters] = move
+
+    def bestMove(self, rack):
+        """
+        :param rack: List of tiles of the rack, of at most reach tiles.
+
+        :returns the same Move as movegen.bestMove over the moves of the rack, None if there is no move.
+        """
+        assert len(rack) <= self.reach, "The rack holds more tiles than the evaluator was built for!"
+        counts = collections.Counter(rack)
+        letters = sorted(counts)
+        # Every set of letters the rack holds is looked up, as the number of every letter it takes
+        moves = []
+        for taken in itertools.product(*[range(counts[letter] + 1) for letter in letters]):
+            move = self.best.get("".join(letter * count for letter, count in zip(letters, taken)))
+            if move is not None:
+                moves.append(move)
+        return movegen.bestMove(moves)
+
+    def bestMoves(self, racks):
+        """
+        :param racks: Iterable of racks as lists of tiles.
+
+        :returns a list of the best Move of every rack in the same order, None for the racks without a move.
+        Racks holding the same tiles are only evaluated once.
+        """
+        found = {}
+        moves = []
+        for rack in racks:
+            key = "".join(sorted(rack))
+            if key not in found:
+                found[key] = self.bestMove(rack)
+            moves.append(found[key])
+        return moves
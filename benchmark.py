@@ -0,0 +1,331 @@
+"""
+Description: Benchmarks of move generation, validation, placement, dictionary loading, the time to the
+first prompt of a game, and board printing whole or through the incremental renderer.
+Boards are loaded from the fixtures in the "fixtures" directory so that every run times the same work.
+Run "python benchmark.py --help" for the options.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import engine
+import exception
+import lexicon
+import render
+import scrabble
+import simulate
+
+FIXTURES_DIRECTORY = os.path.join(engine.DATA_DIRECTORY, "fixtures")
+FIXTURE_SIZES = [5, 10, 15]
+FIXTURE_FILLS = {"sparse": 0.1, "medium": 0.25, "dense": 0.4}     # Fraction of the board occupied
+SEED = 2020
+WORD_SAMPLE = 200           # Number of words checked by each wordIsValid benchmark
+
+def fixturePath(boardSize, fill):
+    """
+    :returns the path of the fixture with the given board size and fill.
+    """
+    return os.path.join(FIXTURES_DIRECTORY, "board-" + str(boardSize) + "-" + fill + ".txt")
+
+def clearCaches(game):
+    """
+    Forgets the line moves of the game and the candidate words of the racks of its engine.
+
+    :param game: GameState whose caches are cleared.
+    """
+    game.hintCache.clear()
+    game.engine.candidateCache.clear()
+
+def writeFixture(path, game):
+    """
+    Writes the board and tiles of a game into a fixture.
+    The first line holds the tiles in hand, the following ones the rows of the board with "." for empty cells.
+
+    :param path: Path of the fixture.
+
+    :param game: GameState to be saved.
+    """
+    fixtureFile = open(path, "w")
+    fixtureFile.write("".join(game.currentTiles) + "\n")
+    for row in game.board:
+        fixtureFile.write("".join(letter or "." for letter in row) + "\n")
+    fixtureFile.close()
+
+def loadFixture(scrabbleEngine, path, backend="list"):
+    """
+    :param scrabbleEngine: Engine to create the game from.
+
+    :param path: Path of the fixture, see writeFixture.
+
+    :param backend: Board backend of the game, see engine.GameState, defaults to "list".
+
+    :returns a GameState with the board and tiles of the fixture.
+    """
+    fixtureFile = open(path)
+    lines = [line.strip() for line in fixtureFile]
+    fixtureFile.close()
+
+    game = scrabbleEngine.newGame(len(lines) - 1, backend=backend)
+    game.currentTiles = list(lines[0])
+    for i, row in enumerate(lines[1:]):
+        for j, letter in enumerate(row):
+            if letter != ".":
+                game.setTile(i, j, letter)
+                game.occupiedTiles += 1
+    if game.occupiedTiles > 0:
+        game.move = 2
+    return game
+
+def generateFixtures(scrabbleEngine):
+    """
+    Plays seeded games with the best move and saves the first position reaching every fill of every size.
+
+    :param scrabbleEngine: Engine to play with.
+    """
+    os.makedirs(FIXTURES_DIRECTORY, exist_ok=True)
+    for boardSize in FIXTURE_SIZES:
+        for fill, fraction in FIXTURE_FILLS.items():
+            target = max(1, round(fraction * boardSize ** 2))
+            seed = SEED
+            while True:
+                game = scrabbleEngine.newGame(boardSize, simulate.dealTiles(scrabbleEngine.tiles, seed))
+                game.getCurrentTiles()
+                while game.occupiedTiles < target:
+                    [bestWord, bestScore, bestLocation] = game.getCurrentBest()
+                    if bestWord is None:
+                        break
+                    game.locationIsValid(bestLocation, bestWord)
+                    game.endTurn()
+                if game.occupiedTiles >= target:
+                    break
+                seed += 1
+            writeFixture(fixturePath(boardSize, fill), game)
+
+def timeCall(function, setup=None, repeat=5, number=None, budget=0.2):
+    """
+    Times a function in repeated batches of calls.
+
+    :param function: Function to be timed, called with the result of setup if given.
+
+    :param setup: Function called before every call and left out of the timing, defaults to None.
+
+    :param repeat: Number of batches, defaults to 5.
+
+    :param number: Number of calls in a batch, defaults to None to fit the time budget.
+
+    :param budget: Time in seconds a batch should take when the number of calls is chosen.
+
+    :returns a map with the number of calls per batch and the best, median and mean time per call in seconds.
+    """
+    def runBatch(calls):
+        elapsed = 0
+        for _ in range(calls):
+            argument = setup() if setup is not None else None
+            start = time.perf_counter_ns()
+            if setup is not None:
+                function(argument)
+            else:
+                function()
+            elapsed += time.perf_counter_ns() - start
+        return elapsed / calls / 1e9
+
+    if number is None:
+        perCall = runBatch(1)
+        number = max(1, min(10000, int(budget / perCall) if perCall > 0 else 10000))
+    times = [runBatch(number) for _ in range(repeat)]
+    return {"number": number, "best": min(times), "median": statistics.median(times),
+            "mean": statistics.mean(times)}
+
+def expectTilesError(function):
+    """
+    :param function: Function that should raise TilesError.
+
+    :returns a function calling it and ignoring the TilesError.
+    """
+    def call(argument):
+        try:
+            function(argument)
+        except exception.TilesError:
+            return
+        raise AssertionError("The placement was expected to be reverted!")
+    return call
+
+def findRevertedPlacement(game):
+    """
+    Looks for a placement that placeTilesOnBoard reverts: a word from the tiles put down without touching the board.
+
+    :param game: GameState after the first move.
+
+    :returns a list of the split location and the word, None if there is no empty line long enough.
+    """
+    word = "".join(game.currentTiles[:2])
+    for i in range(len(game.board)):
+        for j in range(len(game.board) - len(word) + 1):
+            if all(game.board[i][j + k] == "" for k in range(len(word))):
+                return [[i + 1, j + 1, "H"], word]
+    return None
+
+def timeFirstPrompt(dictionaryPath, background, cold, repeat=5):
+    """
+    Times the start of a terminal game up to its first prompt: creating the engine and printing the rules.
+    The engine is left to finish loading between the calls, out of the timing.
+
+    :param dictionaryPath: Path of a dictionary whose compiled lexicon may be removed.
+
+    :param background: Whether the engine loads its lexicon in the background.
+
+    :param cold: Whether the compiled lexicon is removed before every call, so that it is compiled again.
+
+    :param repeat: Number of timed calls, defaults to 5.
+
+    :returns a map with the number of calls per batch and the best, median and mean time per call in seconds.
+    """
+    binaryPath = os.path.splitext(dictionaryPath)[0] + ".lex"
+    times = []
+    for _ in range(repeat):
+        if cold and os.path.exists(binaryPath):
+            os.remove(binaryPath)
+        start = time.perf_counter_ns()
+        scrabbleEngine = engine.Engine(dictionaryPath, background=background)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scrabble.welcomeMessage()
+        times.append((time.perf_counter_ns() - start) / 1e9)
+        scrabbleEngine.waitUntilLoaded(indexes=True)
+    return {"number": 1, "best": min(times), "median": statistics.median(times), "mean": statistics.mean(times)}
+
+def runBenchmarks(scrabbleEngine, repeat=5):
+    """
+    :param scrabbleEngine: Engine to run the benchmarks with.
+
+    :param repeat: Number of timed batches of every benchmark, defaults to 5.
+
+    :returns a map with benchmark names as keys and the results of timeCall as values.
+    """
+    results = {}
+    dictionaryPath = os.path.join(engine.DATA_DIRECTORY, "dictionary.txt")
+    results["createDictionary/compiled"] = timeCall(lambda: lexicon.loadLexicon(dictionaryPath), repeat=repeat)
+    results["createDictionary/text"] = timeCall(lambda: lexicon.Lexicon(lexicon.readWords(dictionaryPath)),
+                                                repeat=repeat, number=1)
+
+    # The dictionary is copied so that its compiled lexicon can be removed
+    with tempfile.TemporaryDirectory() as directory:
+        copyPath = os.path.join(directory, "dictionary.txt")
+        shutil.copyfile(dictionaryPath, copyPath)
+        for state in ["cold", "warm"]:
+            for mode in ["foreground", "background"]:
+                results["firstPrompt/" + state + "/" + mode] = timeFirstPrompt(copyPath, mode == "background",
+                                                                               state == "cold", repeat)
+
+    rng = random.Random(SEED)
+    words = list(scrabbleEngine.dictionary.wordsWithinLength(15))
+    words = rng.sample(words, WORD_SAMPLE // 2) + ["".join(rng.sample(lexicon.ALPHABET, 5))
+                                                 for _ in range(WORD_SAMPLE // 2)]
+
+    for boardSize in FIXTURE_SIZES:
+        for fill in FIXTURE_FILLS:
+            name = str(boardSize) + "-" + fill
+            path = fixturePath(boardSize, fill)
+            game = loadFixture(scrabbleEngine, path)
+
+            # The caches are cleared before every call so that every call searches the whole board
+            results["getCurrentBest/" + name] = timeCall(lambda cleared: game.getCurrentBest(),
+                                                         setup=lambda: clearCaches(game), repeat=repeat)
+            results["wordIsValid/" + name] = timeCall(lambda: [game.wordIsValid(word) for word in words],
+                                                      repeat=repeat)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                results["printBoard/" + name] = timeCall(lambda: scrabble.printBoard(game.board), repeat=repeat)
+                # The renderer keeps the rows of the first frame, the next frames format no row again
+                renderer = render.BoardRenderer()
+                results["renderBoard/" + name] = timeCall(lambda: renderer.render(game.board), repeat=repeat)
+
+            [bestWord, bestScore, bestLocation] = game.getCurrentBest()
+            if bestWord is not None:
+                location = engine.locationValidFormat(bestLocation)
+                results["placeTilesOnBoard/success/" + name] = timeCall(
+                    lambda fixture: fixture.placeTilesOnBoard(location, bestWord),
+                    setup=lambda: loadFixture(scrabbleEngine, path), repeat=repeat)
+
+            reverted = findRevertedPlacement(game)
+            if reverted is not None:
+                results["placeTilesOnBoard/revert/" + name] = timeCall(
+                    expectTilesError(lambda fixture: fixture.placeTilesOnBoard(*reverted)),
+                    setup=lambda: loadFixture(scrabbleEngine, path), repeat=repeat)
+    return results
+
+def compareResults(baseline, current, threshold=0.1):
+    """
+    Compares the best times of two runs, which are the least affected by other load on the machine.
+
+    :param baseline: Results of the earlier run.
+
+    :param current: Results of the later run.
+
+    :param threshold: Relative slowdown flagged as a regression, defaults to 0.1 for 10%.
+
+    :returns a list of [name, baseline time, current time, ratio, regressed] for the benchmarks of both runs.
+    """
+    comparison = []
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name]["best"]
+        after = current[name]["best"]
+        ratio = after / before if before > 0 else float("inf")
+        comparison.append([name, before, after, ratio, ratio > 1 + threshold])
+    return comparison
+
+def formatSeconds(seconds):
+    """
+    :returns the time with the most readable unit.
+    """
+    for unit, scale in [["s", 1], ["ms", 1e-3], ["us", 1e-6]]:
+        if seconds >= scale:
+            return format(seconds / scale, ".2f") + unit
+    return format(seconds / 1e-9, ".0f") + "ns"
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the scrabble benchmarks.")
+    parser.add_argument("--output", help="file to write the JSON results to, printed otherwise")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed batches of every benchmark")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two JSON results instead of running the benchmarks")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown flagged as a regression")
+    parser.add_argument("--generate-fixtures", action="store_true", help="regenerate the board fixtures")
+    arguments = parser.parse_args()
+
+    if arguments.compare:
+        runs = []
+        for path in arguments.compare:
+            with open(path) as resultsFile:
+                runs.append(json.load(resultsFile)["results"])
+        regressions = 0
+        for name, before, after, ratio, regressed in compareResults(*runs, arguments.threshold):
+            regressions += regressed
+            print(name.ljust(40) + formatSeconds(before).rjust(10) + formatSeconds(after).rjust(10) +
+                  format(ratio, ".2f").rjust(8) + "x" + ("  REGRESSION" if regressed else ""))
+        sys.exit(1 if regressions else 0)
+
+    scrabbleEngine = engine.Engine()
+    if arguments.generate_fixtures:
+        generateFixtures(scrabbleEngine)
+
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": SEED,
+              "results": runBenchmarks(scrabbleEngine, arguments.repeat)}
+    if arguments.output:
+        with open(arguments.output, "w") as resultsFile:
+            json.dump(report, resultsFile, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
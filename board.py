@@ -0,0 +1,212 @@
+"""
+Description: Indexes of the board, kept up to date as tiles are placed and removed: the tiles
+with their positions, and the slots where words of every length can go.
+"""
+
+import collections
+
+class BoardIndex:
+    """
+    Maps every letter on the board to the set of its coordinates, and keeps a bitmap of
+    the occupied cells of every row and column (bit j of a row is column j).
+    """
+
+    def __init__(self, boardSize=0):
+        """
+        :param boardSize: The board's size, defaults to 0 for an index to be reset later.
+        """
+        self.reset(boardSize)
+
+    def reset(self, boardSize):
+        """
+        Empties the index for a board of the given size.
+
+        :param boardSize: The board's size.
+        """
+        self.positions = {}                 # A map with letters as keys and sets of [row, col] as values
+        self.rowMasks = [0] * boardSize     # Occupied columns of every row
+        self.colMasks = [0] * boardSize     # Occupied rows of every column
+        self.occupied = 0                   # Number of occupied cells
+
+    def add(self, letter, row, col):
+        """
+        Records a tile placed on the board. Recording an existing tile again has no effect.
+
+        :param letter: Letter of the tile.
+
+        :param row: 0-based row of the tile.
+
+        :param col: 0-based column of the tile.
+        """
+        if self.rowMasks[row] >> col & 1:
+            return
+        self.positions.setdefault(letter, set()).add((row, col))
+        self.rowMasks[row] |= 1 << col
+        self.colMasks[col] |= 1 << row
+        self.occupied += 1
+
+    def remove(self, letter, row, col):
+        """
+        Forgets a tile removed from the board.
+
+        :param letter: Letter of the tile.
+
+        :param row: 0-based row of the tile.
+
+        :param col: 0-based column of the tile.
+        """
+        if not self.rowMasks[row] >> col & 1:
+            return
+        self.positions[letter].discard((row, col))
+        if not self.positions[letter]:
+            del self.positions[letter]
+        self.rowMasks[row] &= ~(1 << col)
+        self.colMasks[col] &= ~(1 << row)
+        self.occupied -= 1
+
+    def positionsOf(self, letter):
+        """
+        :param letter: Letter to be looked up.
+
+        :returns the set of [row, col] holding the letter, empty if the letter is not on the board.
+        """
+        return self.positions.get(letter, set())
+
+    def isOccupied(self, row, col):
+        """
+        :returns True if the cell holds a tile.
+        """
+        return self.rowMasks[row] >> col & 1 == 1
+
+class SlotIndex:
+    """
+    Maps every slot of the board to the letters fixed in it, for the word by word move search.
+    A slot is an interval of a row or column holding at least one tile and between one and as many
+    empty cells as there are tiles in the rack, which are the only places a move can go.
+    Slots are keyed by their length and by the offset and letter of each of their tiles, so that
+    the slots of a word are the ones where one of its letters falls on the same tile.
+    Only the lines changed since the last update are computed again.
+    """
+
+    def __init__(self, boardSize=0):
+        """
+        :param boardSize: The board's size, defaults to 0 for an index to be reset later.
+        """
+        self.reset(boardSize)
+
+    def reset(self, boardSize):
+        """
+        Empties the index for a board of the given size, every line is computed on the next update.
+
+        :param boardSize: The board's size.
+        """
+        self.boardSize = boardSize
+        self.reach = None                       # Number of tiles in the rack the slots were computed for
+        self.slots = {}                         # A map with [length, offset, letter] as keys and sets of slots
+        self.lengths = collections.Counter()    # Number of slots of every length
+        self.lineSlots = {}                     # A map with [direction, line index] as keys and [keys, lengths]
+        self.changed = set()                    # [direction, line index] of the lines to be computed again
+
+    def invalidate(self, row, col):
+        """
+        Marks the row and column of a cell whose tile was placed or removed.
+
+        :param row: 0-based row of the cell.
+
+        :param col: 0-based column of the cell.
+        """
+        self.changed.add(("H", row))
+        self.changed.add(("V", col))
+
+    def update(self, board, index, reach):
+        """
+        Computes the slots of the changed lines, or of every line when the rack size changes.
+
+        :param board: Board as a list of rows of letters, "" for empty cells.
+
+        :param index: BoardIndex of the board.
+
+        :param reach: Number of tiles in the rack.
+        """
+        if reach != self.reach:
+            self.reset(self.boardSize)
+            self.reach = reach
+            self.changed = {("H", i) for i in range(self.boardSize) if index.rowMasks[i]} | \
+                           {("V", j) for j in range(self.boardSize) if index.colMasks[j]}
+
+        for direction, lineIndex in self.changed:
+            keys, lengths = self.lineSlots.pop((direction, lineIndex), ((), ()))
+            for key, slot in keys:
+                self.slots[key].discard(slot)
+                if not self.slots[key]:
+                    del self.slots[key]
+            self.lengths.subtract(lengths)
+            self.addLine(direction, lineIndex, board, index)
+        self.changed.clear()
+        self.lengths += collections.Counter()     # Drops the lengths left without slots
+
+    def addLine(self, direction, lineIndex, board, index):
+        """
+        Records the slots of a line. Every start within reach of a tile is extended cell by cell
+        until the slot holds more empty cells than the rack has tiles.
+        """
+        mask = index.rowMasks[lineIndex] if direction == "H" else index.colMasks[lineIndex]
+        positions = []
+        while mask:
+            low = mask & -mask
+            positions.append(low.bit_length() - 1)
+            mask ^= low
+        if not positions:
+            return
+        if direction == "H":
+            letters = [board[lineIndex][position] for position in positions]
+        else:
+            letters = [board[position][lineIndex] for position in positions]
+
+        keys = []
+        lengths = []
+        first = 0           # First tile at or after the start
+        for start in range(max(0, positions[0] - self.reach), positions[-1] + 1):
+            while positions[first] < start:
+                first += 1
+            if positions[first] - start > self.reach:
+                continue
+            slot = (lineIndex, start, "H") if direction == "H" else (start, lineIndex, "V")
+            last = first    # First tile after the end
+            for end in range(start + 1, self.boardSize + 1):
+                if last < len(positions) and positions[last] == end - 1:
+                    last += 1
+                empty = end - start - (last - first)
+                if empty > self.reach:
+                    break
+                if empty == 0 or last == first:
+                    continue
+                length = end - start
+                lengths.append(length)
+                for tile in range(first, last):
+                    key = (length, positions[tile] - start, letters[tile])
+                    self.slots.setdefault(key, set()).add(slot)
+                    keys.append((key, slot))
+        self.lineSlots[direction, lineIndex] = (keys, lengths)
+        self.lengths.update(lengths)
+
+    def maxLength(self):
+        """
+        :returns the length of the longest slot, 0 if there is none.
+        """
+        return max(self.lengths, default=0)
+
+    def slotsOf(self, word):
+        """
+        :param word: Word to be placed.
+
+        :returns the set of [row, col, direction] of the slots of the word's length where
+        one of its letters falls on a tile holding the same letter.
+        """
+        slots = set()
+        length = len(word)
+        for offset in range(length):
+            found = self.slots.get((length, offset, word[offset]))
+            if found:
+                slots |= found
+        return slots
@@ -0,0 +1,151 @@
+"""
+Description: Directed acyclic word graph (DAWG) of the lexicon.
+The graph is the minimal automaton accepting the words and is stored in flat arrays so that it
+can be written into the compiled lexicon and walked straight from the mapped file.
+"""
+
+import array
+
+ROOT = 0    # Index of the root node
+
+class Dawg:
+    """
+    Flat DAWG. The edges of node n are edgeLetters[edgeStarts[n]:edgeStarts[n + 1]] in sorted order,
+    leading to the nodes at the same positions in edgeTargets.
+    """
+
+    def __init__(self, edgeStarts, edgeLetters, edgeTargets, terminals):
+        """
+        :param edgeStarts: Sequence with the first edge of every node followed by the total number of edges.
+
+        :param edgeLetters: Bytes with the letter code of every edge.
+
+        :param edgeTargets: Sequence with the target node of every edge.
+
+        :param terminals: Bytes with 1 for every node that ends a word, 0 otherwise.
+        """
+        self.edgeStarts = edgeStarts
+        self.edgeLetters = edgeLetters
+        self.edgeTargets = edgeTargets
+        self.terminals = terminals
+
+    def child(self, node, letter):
+        """
+        :param node: Index of the node.
+
+        :param letter: Letter code of the edge to follow.
+
+        :returns the index of the node reached through the letter, -1 if there is no such edge.
+        """
+        edge = self.edgeLetters.find(letter, self.edgeStarts[node], self.edgeStarts[node + 1])
+        if edge < 0:
+            return -1
+        return self.edgeTargets[edge]
+
+    def isTerminal(self, node):
+        """
+        :param node: Index of the node.
+
+        :returns True if a word ends at the node.
+        """
+        return self.terminals[node] == 1
+
+    def walk(self, string, node=ROOT):
+        """
+        :param string: Letters to follow from the node.
+
+        :param node: Index of the node to start from, defaults to the root.
+
+        :returns the index of the node reached, -1 if the letters leave the graph.
+        """
+        for letter in string.encode("ascii"):
+            node = self.child(node, letter)
+            if node < 0:
+                break
+        return node
+
+    def __contains__(self, word):
+        node = self.walk(word)
+        return node >= 0 and self.isTerminal(node)
+
+    def toSections(self):
+        """
+        :returns a list of [name, bytes] sections for the compiled lexicon.
+        """
+        return [["DAWGSTRT", array.array("I", self.edgeStarts).tobytes()],
+                ["DAWGLTRS", bytes(self.edgeLetters)],
+                ["DAWGTRGT", array.array("I", self.edgeTargets).tobytes()],
+                ["DAWGTERM", bytes(self.terminals)]]
+
+def fromSections(sections):
+    """
+    :param sections: A map with section names as keys and buffers as values.
+
+    :returns a Dawg over the sections. Only the edge letters are copied, for fast searching.
+    """
+    return Dawg(sections["DAWGSTRT"].cast("I"), bytes(sections["DAWGLTRS"]),
+                sections["DAWGTRGT"].cast("I"), sections["DAWGTERM"])
+
+def buildDawg(words):
+    """
+    Builds the minimal DAWG of the words incrementally (Daciuk et al.).
+    Once a word is added, the nodes that are no longer on the path of the next word
+    are merged with equivalent nodes found so far.
+
+    :param words: Iterable of words in sorted order.
+
+    :returns a Dawg of the words.
+    """
+    children = [{}]     # Letter codes to child nodes for every node
+    terminals = [0]
+    register = {}       # Signatures of the merged nodes to the nodes
+    unchecked = []      # [parent, letter, child] on the path of the previous word not merged yet
+
+    def minimize(downTo):
+        while len(unchecked) > downTo:
+            parent, letter, child = unchecked.pop()
+            signature = (terminals[child], tuple(children[child].items()))
+            if signature in register:
+                children[parent][letter] = register[signature]
+            else:
+                register[signature] = child
+
+    previous = b""
+    for word in words:
+        word = word.encode("ascii")
+        assert word > previous, "Words should be unique and in sorted order!"
+        common = 0
+        while common < min(len(word), len(previous)) and word[common] == previous[common]:
+            common += 1
+        minimize(common)
+
+        node = unchecked[-1][2] if unchecked else ROOT
+        for letter in word[common:]:
+            children.append({})
+            terminals.append(0)
+            children[node][letter] = len(children) - 1
+            unchecked.append([node, letter, len(children) - 1])
+            node = len(children) - 1
+        terminals[node] = 1
+        previous = word
+    minimize(0)
+
+    # Numbers the reachable nodes breadth first and flattens their edges
+    numbers = {ROOT: 0}
+    order = [ROOT]
+    for node in order:
+        for child in children[node].values():
+            if child not in numbers:
+                numbers[child] = len(order)
+                order.append(child)
+
+    edgeStarts = array.array("I", [0])
+    edgeLetters = bytearray()
+    edgeTargets = array.array("I")
+    for node in order:
+        for letter, child in children[node].items():
+            edgeLetters.append(letter)
+            edgeTargets.append(numbers[child])
+        edgeStarts.append(len(edgeTargets))
+
+    return Dawg(edgeStarts, bytes(edgeLetters), edgeTargets, bytes(terminals[node] for node in order))
@@ -0,0 +1,738 @@
+"""
+Description: Scrabble engine. An Engine loads the dictionary, score map and tiles once and shares
+them read-only with every GameState created from it, each game owning its board, tiles and score.
+The games of an engine also share a cache of the candidate words of the racks they are dealt.
+The lexicon can be loaded in a background thread while the player is prompted, see Engine.
+"""
+
+import collections
+import os
+import threading
+
+import batch
+import board
+import exception
+import instrument
+import lexicon
+import movegen
+import sparseboard
+
+DATA_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+TILES_COUNT = 7             # Number of tiles to be chosen from in each turn
+GENERATORS = ["dawg", "scan"]   # Move generators of the hints, see GameState.getCurrentBest
+BACKENDS = ["list", "sparse"]  # Board backends of the placements, see GameState
+MAX_BOARD_SIZE = 15         # Largest board of the list backend, see sparseboard for the sparse one
+
+def createScoreMap(scoresPath):
+    """
+    Reads from the scores file and construct a map with letters as keys and scores as values.
+
+    :param scoresPath: Path of the file with a letter and its score on every line.
+
+    :returns the score map.
+    """
+    scores = {}
+    scoreFile = open(scoresPath)
+    for line in scoreFile:
+        line = line.strip()
+        line = line.split(" ")
+        scores[line[0]] = int(line[1])
+    scoreFile.close()
+    return scores
+
+def createTiles(tilesPath):
+    """
+    Reads from the tiles file and construct a list of tiles.
+
+    :param tilesPath: Path of the file with a tile on every line.
+
+    :returns the list of tiles in the order they are dealt.
+    """
+    tiles = []
+    tilesFile = open(tilesPath)
+    for line in tilesFile:
+        line = line.strip()
+        tiles.append(line)
+    tilesFile.close()
+    return tiles
+
+def canBeMadeWithTiles(word, currentTiles):
+    """
+    Determines whether the word can be constructed using the tiles given.
+
+    :param word: A word string to be checked.
+
+    :param currentTiles: A list of tiles to be checked against.
+
+    :returns True if all of the words can be constructed with the given tiles, otherwise
+    returns a list of tiles to be checked against the board and another with the tiles to be used.
+    """
+    tilesToCompare = currentTiles.copy()
+    toCheckInBoard = []
+    tilesToUse = []
+
+    for letter in word:
+        # Looks for letters in the tiles
+        try:
+            tilesToCompare.index(letter)
+            tilesToCompare.remove(letter)
+            tilesToUse.append(letter)
+
+        # Stores letters that are not found to be checked if they exist in the board
+        except ValueError:
+            toCheckInBoard.append(letter)
+
+    if (len(toCheckInBoard) > 0):
+        return [toCheckInBoard, tilesToUse]
+
+    return True
+
+def locationValidFormat(loc):
+    """
+    Determines whether the location is in valid format.
+    Returns a list of [int, int, String] of the split coordinates.
+
+    :param loc: Location string with the format of "_:_:H" or "_:_:V".
+
+    :returns a list of split location if the input is a valid location.
+
+    :raises AssertionError when the coordinates are not numeric or the direction is invalid.
+    """
+    loc = loc.split(":")
+    assert len(loc) == 3, "Location should be in the form of _:_:H or _:_:V !"
+
+    for i in range(len(loc)):
+        loc[i] = loc[i].strip()
+
+        # Checks the coordinates
+        if i == 0 or i == 1:
+            if loc[i].isnumeric():
+                loc[i] = int(loc[i])
+            else:
+                raise AssertionError("Location should be numeric!")
+
+        # Checks the direction
+        elif i == 2:
+            if not (loc[i] == "H" or loc[i] == "V"):
+                raise AssertionError("Invalid direction!")
+
+    return loc
+
+class Engine:
+    """
+    Resources shared by every game: the lexicon, the score map, the tiles and the candidate words of racks.
+    """
+
+    def __init__(self, dictionaryPath=None, scoresPath=None, tilesPath=None, generator="dawg",
+                 candidateCacheSize=1024, sharedLexicon=None, background=False):
+        """
+        :param dictionaryPath: Path of the dictionary, defaults to "dictionary.txt" next to this file.
+
+        :param scoresPath: Path of the score map, defaults to "scores.txt" next to this file.
+
+        :param tilesPath: Path of the tiles, defaults to "tiles.txt" next to this file.
+
+        :param generator: Move generator of the hints, "dawg" or "scan", defaults to "dawg".
+
+        :param candidateCacheSize: Number of racks whose candidate words are kept, defaults to 1024.
+
+        :param sharedLexicon: Name of a shared memory segment published by the shareLexicon method of another
+        engine, to attach to instead of loading the dictionary, defaults to None.
+
+        :param background: Whether to load the lexicon and build its DAWG and base scores in a background thread,
+        defaults to False to load the lexicon before returning. Only the first use of the lexicon waits for
+        it to be loaded, and only the move generators wait for the DAWG and base scores, see waitUntilLoaded.
+
+        :raises AssertionError if the generator is unknown.
+        """
+        assert generator in GENERATORS, "Generator should be one of " + ", ".join(GENERATORS) + "!"
+        self.generator = generator
+        self.dictionaryPath = dictionaryPath or os.path.join(DATA_DIRECTORY, "dictionary.txt")
+        self.sharedName = sharedLexicon        # Shared memory segment of the lexicon, see shareLexicon
+        self.sharedSegment = None               # Segment published by this engine, unlinked by close
+        self.scores = createScoreMap(scoresPath or os.path.join(DATA_DIRECTORY, "scores.txt"))
+        self.tiles = createTiles(tilesPath or os.path.join(DATA_DIRECTORY, "tiles.txt"))
+        self.baseScores = None      # Built on first use, see getBaseScores
+
+        self.loadedLexicon = None
+        self.loadedCache = None
+        self.loadError = None       # Raised by the first use of a lexicon that failed to load
+        self.lexiconLoaded = threading.Event()
+        self.indexesBuilt = threading.Event()
+        if background:
+            self.loader = threading.Thread(target=self.loadLexicon, args=(candidateCacheSize, True), daemon=True)
+            self.loader.start()
+        else:
+            self.loader = None
+            self.loadLexicon(candidateCacheSize, False)
+            if self.loadError is not None:
+                raise self.loadError
+
+    def loadLexicon(self, candidateCacheSize, buildIndexes):
+        """
+        Loads or attaches to the lexicon, then builds its DAWG and base scores if requested.
+        The other indexes are otherwise built on first use.
+
+        :param candidateCacheSize: Number of racks whose candidate words are kept.
+
+        :param buildIndexes: Whether to build the DAWG and base scores.
+        """
+        try:
+            if self.sharedName is not None:
+                self.loadedLexicon = lexicon.attachLexicon(self.sharedName)
+            else:
+                self.loadedLexicon = lexicon.loadLexicon(self.dictionaryPath)
+            self.loadedCache = lexicon.CandidateCache(self.loadedLexicon, candidateCacheSize)
+        except Exception as error:
+            self.loadError = error
+            return
+        finally:
+            self.lexiconLoaded.set()
+
+        try:
+            if buildIndexes:
+                self.loadedLexicon.getDawg()
+                self.baseScores = self.loadedLexicon.getBaseScores(self.scores)
+        finally:
+            self.indexesBuilt.set()
+
+    def waitUntilLoaded(self, indexes=False):
+        """
+        Waits for the lexicon loaded in the background, if it is not loaded yet.
+
+        :param indexes: Whether to also wait for the DAWG and base scores, defaults to False.
+
+        :raises the error the lexicon failed to load with, such as OSError if the dictionary cannot be read.
+        """
+        self.lexiconLoaded.wait()
+        if self.loadError is not None:
+            raise self.loadError
+        if indexes:
+            self.indexesBuilt.wait()
+
+    @property
+    def dictionary(self):
+        """
+        The lexicon of the engine, waiting for it to be loaded, see waitUntilLoaded.
+        """
+        self.waitUntilLoaded()
+        return self.loadedLexicon
+
+    @property
+    def candidateCache(self):
+        """
+        The lexicon.CandidateCache of the engine, waiting for the lexicon to be loaded, see waitUntilLoaded.
+        """
+        self.waitUntilLoaded()
+        return self.loadedCache
+
+    def newGame(self, boardSize=5, tiles=None, backend="list"):
+        """
+        :param boardSize: The board's size, between 5 and 15, or up to 1000 with the "sparse" backend, defaults to 5.
+
+        :param tiles: List of tiles in the order they are dealt, defaults to the tiles of the engine.
+
+        :param backend: Board backend of the placements, "list" or "sparse", defaults to "list".
+
+        :returns a new GameState sharing the resources of the engine.
+
+        :raises AssertionError if the board size or the backend is invalid.
+        """
+        return GameState(self, boardSize, tiles, backend)
+
+    def getBaseScores(self):
+        """
+        :returns an array of the score of all the letters of every word, indexed like the words of the lexicon,
+        taken from a shared lexicon that published them or built if needed, see lexicon.Lexicon.getBaseScores.
+        """
+        self.waitUntilLoaded(indexes=True)
+        if self.baseScores is None:
+            self.baseScores = self.dictionary.getBaseScores(self.scores)
+        return self.baseScores
+
+    def getDawg(self):
+        """
+        :returns the DAWG of the lexicon, waiting for it to be built in the background or building it if needed.
+        """
+        self.waitUntilLoaded(indexes=True)
+        return self.dictionary.getDawg()
+
+    def shareLexicon(self):
+        """
+        Publishes the lexicon and the base scores of its words in shared memory once, for worker processes
+        to attach to with the sharedLexicon parameter, see lexicon.shareLexicon.
+
+        :returns the name of the shared memory segment.
+        """
+        if self.sharedName is None:
+            self.sharedSegment = lexicon.shareLexicon(self.dictionaryPath, scores=self.scores)
+            self.sharedName = self.sharedSegment.name
+        return self.sharedName
+
+    def close(self):
+        """
+        Removes the shared memory segment published by shareLexicon, if any.
+        Processes already attached to it keep their mapping.
+        An engine attached to the segment of another engine closes its lexicon instead, and cannot be used afterwards.
+        """
+        if self.sharedSegment is not None:
+            # The segment may have been removed already, by the resource tracker of another process
+            try:
+                self.sharedSegment.unlink()
+            except FileNotFoundError:
+                pass
+            self.sharedSegment.close()
+            self.sharedSegment = None
+            self.sharedName = None
+        elif self.sharedName is not None and self.loadedLexicon is not None:
+            self.loadedLexicon.close()
+
+class Placement:
+    """
+    Undo record of a word placed on the board: the cells it filled, the tiles it used up
+    with their positions in hand, and the score it added.
+    """
+    __slots__ = ["row", "col", "direction", "word", "cells", "tiles", "existing", "score", "previousScore", "dealt"]
+
+    def __init__(self, row, col, direction, word, previousScore):
+        """
+        :param row: 0-based row of the first letter.
+
+        :param col: 0-based column of the first letter.
+
+        :param direction: "H" or "V".
+
+        :param word: Word placed.
+
+        :param previousScore: Score of the move before, restored when the placement is undone.
+        """
+        self.row = row
+        self.col = col
+        self.direction = direction
+        self.word = word
+        self.cells = []             # [row, col] of the new tiles in the order they were placed
+        self.tiles = []             # [position in hand, letter] of the tiles used, in the order they were taken
+        self.existing = []          # Letters of the existing tiles used
+        self.score = 0
+        self.previousScore = previousScore
+        self.dealt = None           # Number of tiles dealt at the end of the turn, None until it ends
+
+    def positions(self):
+        """
+        :returns a list of the [row, col] of every letter of the word.
+        """
+        if self.direction == "H":
+            return [[self.row, self.col + k] for k in range(len(self.word))]
+        return [[self.row + k, self.col] for k in range(len(self.word))]
+
+class GameState:
+    """
+    State of a single game: its board, the tiles in hand and dealt so far, and the scores.
+    """
+
+    def __init__(self, engine, boardSize=5, tiles=None, backend="list"):
+        """
+        Initializes board with a default value of 5.
+
+        :param engine: Engine providing the lexicon, score map and tiles.
+
+        :param boardSize: The board's size, between 5 and 15, or up to 1000 with the "sparse" backend, defaults to 5.
+
+        :param tiles: List of tiles in the order they are dealt, defaults to the tiles of the engine.
+
+        :param backend: Board backend of the placements, "list" or "sparse", defaults to "list".
+        The "sparse" backend only stores the occupied cells, see sparseboard.SparseBoard.
+
+        :raises AssertionError if the board size or the backend is invalid.
+        """
+        assert backend in BACKENDS, "Backend should be one of " + ", ".join(BACKENDS) + "!"
+        if backend == "sparse":
+            assert sparseboard.MIN_BOARD_SIZE <= boardSize <= sparseboard.MAX_BOARD_SIZE, \
+                "Board size should be between " + str(sparseboard.MIN_BOARD_SIZE) + " and " + \
+                str(sparseboard.MAX_BOARD_SIZE) + "!"
+        else:
+            assert 5 <= boardSize <= MAX_BOARD_SIZE, "Board size should be between 5 and 15!"
+
+        self.engine = engine
+        self.tiles = engine.tiles if tiles is None else tiles
+        if backend == "sparse":
+            self.board = sparseboard.SparseBoard(boardSize)
+        else:
+            self.board = []
+            for _ in range(boardSize):
+                row = []
+                for _ in range(boardSize):
+                    row.append("")
+                self.board.append(row)
+        self.boardIndex = board.BoardIndex(boardSize)   # Letter positions and occupancy of the board
+        self.slotIndex = board.SlotIndex(boardSize)     # Slots of the "scan" generator, see iterMoves
+        self.hintCache = movegen.LineMoveCache(TILES_COUNT)     # Placements along the lines not changed since a hint
+        self.currentTiles = []      # Tiles to be used in the current turn
+        self.usedTiles = 0          # Number of tiles dealt
+        self.occupiedTiles = 0      # Number of tiles occupied on the board
+        self.totalScore = 0         # Total score of player
+        self.moveScore = 0          # Score of the last move
+        self.move = 1               # Number of the current move
+        self.moveLog = []           # Placements made so far, see undoMove
+
+    def isFirstMove(self):
+        """
+        :returns True if no move has been made yet.
+        """
+        return self.move == 1
+
+    def isFull(self):
+        """
+        :returns True if all the tiles of the board are occupied.
+        """
+        return self.occupiedTiles == len(self.board) ** 2
+
+    def getCurrentTiles(self):
+        """
+        Generates tiles for the current move.
+        Only a maximum of 7 tiles are held and should consist of the unused tiles from the previous move.
+        """
+        while len(self.currentTiles) < TILES_COUNT and self.usedTiles < len(self.tiles):
+            self.currentTiles.append(self.tiles[self.usedTiles])
+            self.usedTiles += 1
+
+    def endTurn(self):
+        """
+        Moves on to the next turn after a successful move and deals the tiles for it.
+        The tiles dealt are recorded with the last placement so that undoMove can return them.
+        """
+        self.move += 1
+        usedTiles = self.usedTiles
+        self.getCurrentTiles()
+        if self.moveLog and self.moveLog[-1].dealt is None:
+            self.moveLog[-1].dealt = self.usedTiles - usedTiles
+
+    def setTile(self, row, col, letter):
+        """
+        Places a tile on the board and records it in the board index.
+
+        :param row: 0-based row of the tile.
+
+        :param col: 0-based column of the tile.
+
+        :param letter: Letter of the tile.
+        """
+        self.board[row][col] = letter
+        self.boardIndex.add(letter, row, col)
+        self.slotIndex.invalidate(row, col)
+
+    def removeTile(self, row, col):
+        """
+        Removes a tile from the board and from the board index.
+
+        :param row: 0-based row of the tile.
+
+        :param col: 0-based column of the tile.
+        """
+        self.boardIndex.remove(self.board[row][col], row, col)
+        self.slotIndex.invalidate(row, col)
+        self.board[row][col] = ""
+
+    def areLettersFromBoard(self, letterList):
+        """
+        Determines whether the letters already exists in the board.
+        Positions are looked up in the board index instead of scanning the board.
+
+        :param letterList: A list of letters to be checked.
+
+        :returns a list of list, each consists of an alphabet with the x and y coordinates on the board,
+        if all letters exist in the board as many times as they are listed, false otherwise.
+        """
+        letters = []
+
+        # A letter listed more than once needs as many tiles, each tile is only listed once
+        for letter, count in collections.Counter(letterList).items():
+            positions = self.boardIndex.positionsOf(letter)
+            if len(positions) < count:
+                return False
+            for i, j in sorted(positions):
+                letters.append([letter, i, j])
+
+        if (len(letters) == 0):
+            return False
+        return letters
+
+    def wordIsValid(self, word):
+        """
+        Determines whether the input word is valid.
+
+        :param word: Valid word with pure alphabets, exists in the dictionary list and \
+        uses letters from the current tiles or existing ones on the board.
+
+        :returns True if the word only contains letters from the given tiles or existing tiles from the board.
+        """
+        # Word should not contain number, white space or special characters
+        if not word.isalpha():
+            return False
+
+        # Word should be in the dictionary
+        if word not in self.engine.dictionary:
+            return False
+
+        # Word in the first move should not contain any external tiles.
+        if self.isFirstMove():
+            if canBeMadeWithTiles(word, self.currentTiles):
+                return True
+            return False
+
+        # Following move must use given tiles and at least one existing tile
+        allLettersFromTiles = canBeMadeWithTiles(word, self.currentTiles)
+
+        # All letters are found in tiles and some from the board.
+        if (allLettersFromTiles == True):
+            existingTiles = self.areLettersFromBoard(word)
+
+        # Some letters are not found in tiles but are found from the board.
+        elif isinstance(allLettersFromTiles, list):
+            existingTiles = self.areLettersFromBoard(allLettersFromTiles[0])
+
+        if isinstance(existingTiles, list):
+            return True
+
+        return False
+
+    def locationIsValid(self, loc, word):
+        """
+        Determines whether the input location is valid.
+        Valid location is in the correct format and within the range of the board.
+
+        :param loc: Location string to place the word in the board.
+
+        :param word: Chosen word string for the current move.
+
+        :returns True if the location is valid and word is successfully placed into the board.
+
+        :raises AssertionError if the location or the word is out of the range of the board.
+
+        :raises TilesError if the word could not be placed, see placeTilesOnBoard.
+        """
+        loc = locationValidFormat(loc)
+
+        # Ensures that the coordinates are within the board
+        assert (0 < loc[0] <= len(self.board) and 0 < loc[1] <= len(self.board)), \
+            "Please select a location within the board!"
+
+        # Ensures that the word can fit into the board
+        assert (loc[2] == "H" and len(word) + loc[1] - 1 <= len(self.board)) or \
+            (loc[2] == "V" and len(word) + loc[0] - 1 <= len(self.board)), \
+            "The word could not fit into the board!"
+
+        # Attempts to place the word into the board
+        self.placeTilesOnBoard(loc, word)
+        return True
+
+    def placeTilesOnBoard(self, loc, word):
+        """
+        Places tiles of the selected word onto the board and adds the score of the move.
+        Letters are written into the board as they are checked, and the placement is rolled back
+        from its undo record if the word breaks the rules, leaving the board and tiles unchanged.
+
+        :param loc: List of selected location.
+
+        :param word: Selected word for the current move.
+
+        :returns the Placement recorded in the move log, see undoMove.
+
+        :raises TilesError if an existing tile is overwritten, an existing tile is not used,
+        or when neither an existing nor a given tile is used.
+        """
+        placement = Placement(loc[0] - 1, loc[1] - 1, loc[2], word, self.moveScore)
+        try:
+            for k, (row, col) in enumerate(placement.positions()):
+                letter = word[k]
+
+                # Ensures that no existing tile is overwritten
+                if self.board[row][col] != "":
+                    if self.board[row][col] != letter:
+                        raise exception.TilesError("You must not overwrite existing tiles on the board!")
+                    placement.existing.append(letter)
+                    continue
+
+                # The tile exist in the board but is at a different location
+                if letter not in self.currentTiles:
+                    raise exception.TilesError("You must only use the existing or given tiles!")
+                self.useTile(placement, row, col, letter)
+
+            # Revert if no existing tile is used
+            if not self.isFirstMove() and len(placement.existing) == 0:
+                raise exception.TilesError("You must use at least one existing tile!")
+        except exception.TilesError:
+            self.rollBack(placement)
+            raise
+
+        self.commitPlacement(placement)
+        return placement
+
+    def useTile(self, placement, row, col, letter):
+        """
+        Moves a tile from the current tiles onto an empty cell and records it in the placement.
+
+        :param placement: Placement being made.
+
+        :param row: 0-based row of the cell.
+
+        :param col: 0-based column of the cell.
+
+        :param letter: Letter of the tile, which must be in the current tiles.
+        """
+        position = self.currentTiles.index(letter)
+        del self.currentTiles[position]
+        placement.tiles.append([position, letter])
+        placement.cells.append([row, col])
+        self.setTile(row, col, letter)
+        self.occupiedTiles += 1
+        placement.score += self.engine.scores[letter]
+
+    def rollBack(self, placement):
+        """
+        Takes the tiles of a placement back into the current tiles, in their previous order.
+
+        :param placement: Placement whose tiles are to be taken back.
+        """
+        for row, col in reversed(placement.cells):
+            self.removeTile(row, col)
+        self.occupiedTiles -= len(placement.cells)
+        for position, letter in reversed(placement.tiles):
+            self.currentTiles.insert(position, letter)
+
+    def commitPlacement(self, placement):
+        """
+        Adds the score of a successful placement and records it in the move log.
+
+        :param placement: Placement that was made.
+        """
+        self.moveLog.append(placement)
+        self.hintCache.invalidatePlacement(placement.row, placement.col, placement.direction, len(placement.word))
+        self.moveScore = placement.score
+        self.totalScore += self.moveScore
+
+    def undoMove(self):
+        """
+        Takes back the last placement, and the tiles dealt after it if its turn was ended.
+        Only the cells and tiles of the placement are touched, nothing is copied.
+
+        :returns the Placement taken back, None if no placement is left.
+        """
+        if not self.moveLog:
+            return None
+        placement = self.moveLog.pop()
+
+        # Tiles dealt at the end of the turn are the last ones in hand
+        if placement.dealt is not None:
+            del self.currentTiles[len(self.currentTiles) - placement.dealt:]
+            self.usedTiles -= placement.dealt
+            self.move -= 1
+
+        self.rollBack(placement)
+        self.hintCache.invalidatePlacement(placement.row, placement.col, placement.direction, len(placement.word))
+        self.totalScore -= placement.score
+        self.moveScore = placement.previousScore
+        return placement
+
+    def iterMoves(self):
+        """
+        Generates the legal moves for the current tiles lazily, so that callers may stop early.
+        With the "dawg" generator, moves are generated from the lexicon DAWG, see movegen.generateMoves,
+        the moves of the lines not changed since the last hint are taken from the hint cache, and the
+        words of the first move are the candidate words of the rack from the candidate cache of the engine,
+        scored with the base scores of the engine.
+        With the "scan" generator, the candidate words of the rack are taken from the candidate cache
+        of the engine while the board is sparse, and placed on the board, see movegen.scanMoves.
+
+        :returns movegen.Move objects with the word, 0-based row and column, direction and score,
+        in no particular order.
+        """
+        if self.engine.generator == "scan":
+            return movegen.scanMoves(self.board, self.currentTiles, self.isFirstMove(), self.engine.dictionary,
+                                     self.engine.scores, self.boardIndex, self.engine.candidateCache,
+                                     self.engine.getBaseScores(), self.slotIndex)
+        return movegen.generateMoves(self.board, self.currentTiles, self.isFirstMove(), self.engine.getDawg(),
+                                     self.engine.scores, self.boardIndex, self.hintCache, self.engine.candidateCache,
+                                     self.engine.getBaseScores())
+
+    def getTopMoves(self, count, minScore=None):
+        """
+        Generates the moves with the highest scores, keeping no more than count of them at a time.
+
+        :param count: Maximum number of moves to be returned.
+
+        :param minScore: Minimum score of the moves, defaults to None for any score.
+
+        :returns a list of lists consisting of a word, its score, and its location in the board, best first.
+        """
+        return [[move.word, move.score, move.location()] for move in movegen.topMoves(self.iterMoves(), count,
+                                                                                        minScore)]
+
+    def hasLegalMove(self):
+        """
+        Determines whether any move is possible, stopping at the first legal move found.
+
+        :returns True if at least one move is possible.
+        """
+        return movegen.anyMove(self.iterMoves()) is not None
+
+    def getCurrentBest(self, hintPool=None):
+        """
+        Generates move with the maximum score, see iterMoves.
+
+        :param hintPool: parallel.HintPool to search with, defaults to None to search in this process.
+
+        :returns a list consisting of word with maximum score, the score, and its location in the board.
+        """
+        if instrument.ENABLED:
+            instrument.beginTurn(self)
+            hits, misses = self.hintCache.hits, self.hintCache.misses
+            rackHits, rackMisses = self.engine.candidateCache.hits, self.engine.candidateCache.misses
+        if hintPool is not None:
+            move = hintPool.bestMove(self.board, self.currentTiles, self.isFirstMove(), self.boardIndex)
+        else:
+            move = movegen.bestMove(self.iterMoves())
+        if instrument.ENABLED:
+            instrument.count("linesCached", self.hintCache.hits - hits)
+            instrument.count("linesWalked", self.hintCache.misses - misses)
+            instrument.count("racksCached", self.engine.candidateCache.hits - rackHits)
+            instrument.count("racksSwept", self.engine.candidateCache.misses - rackMisses)
+            instrument.endTurn(move)
+
+        # No valid move is found
+        if move is None:
+            return [None, 0, None]
+        return [move.word, move.score, move.location()]
+
+    def getBatchBest(self, racks):
+        """
+        Generates the move with the maximum score of every rack on the current board, as getCurrentBest
+        would with the rack as the current tiles. The placements of the board are found once for all
+        the racks, see batch.BatchEvaluator.
+
+        :param racks: List of racks as lists of tiles.
+
+        :returns a list of [word, score, location] for every rack in the same order,
+        [None, 0, None] for the racks without a valid move.
+        """
+        if not racks:
+            return []
+        evaluator = batch.BatchEvaluator(self.board, self.isFirstMove(), self.engine.dictionary, self.engine.scores,
+                                         self.boardIndex, self.slotIndex, max(len(rack) for rack in racks))
+        return [[None, 0, None] if move is None else [move.word, move.score, move.location()]
+                for move in evaluator.bestMoves(racks)]
+
+    def getPlannedBest(self, gamePlanner):
+        """
+        Generates the move leading to the maximum total score over the next moves, see planner.Planner.
+
+        :param gamePlanner: planner.Planner searching the moves of this game.
+
+        :returns a list consisting of the word, its score, its location in the board, and the projected total score.
+        """
+        move, projectedScore = gamePlanner.plan(self)[:2]
+
+        # No valid move is found
+        if move is None:
+            return [None, 0, None, self.totalScore]
+        return [move.word, move.score, move.location(), projectedScore]
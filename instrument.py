@@ -0,0 +1,147 @@
+"""
+Description: Opt-in instrumentation of hint computation.
+Every getCurrentBest call is recorded as a turn with per-phase timers and counters, written as a
+JSON line, or profiled with cProfile into a pstats file per turn. Enabled by setting the
+SCRABBLE_PROFILE environment variable to "stats" or "cprofile" (SCRABBLE_PROFILE_OUTPUT sets where
+to write), or with the --profile options of scrabble.py and simulate.py.
+Instrumented code checks ENABLED before recording anything, so nothing is measured when it is off.
+"""
+
+import cProfile
+import json
+import os
+import time
+import warnings
+
+MODES = ["stats", "cprofile"]
+DEFAULT_OUTPUTS = {"stats": "scrabble-profile.jsonl", "cprofile": "scrabble-profile"}
+
+ENABLED = False         # Whether turns are recorded
+MODE = None             # One of MODES
+OUTPUT = None           # JSON lines file in "stats" mode, directory of pstats files in "cprofile" mode
+TURN = None             # Record of the turn being measured
+PROFILER = None         # Profiler of the turn being measured in "cprofile" mode
+TURNS = 0               # Number of turns recorded by this process
+
+def configure(mode, output=None):
+    """
+    Enables or disables the instrumentation.
+
+    :param mode: "stats", "cprofile", or None to disable.
+
+    :param output: Where to write the turns, defaults to "scrabble-profile.jsonl" in "stats" mode
+    and the "scrabble-profile" directory in "cprofile" mode.
+
+    :raises ValueError if the mode is unknown.
+    """
+    global ENABLED, MODE, OUTPUT
+    if mode is not None and mode not in MODES:
+        raise ValueError("Profile mode should be one of " + ", ".join(MODES) + "!")
+    ENABLED = mode is not None
+    MODE = mode
+    OUTPUT = output or DEFAULT_OUTPUTS.get(mode)
+    if mode == "cprofile":
+        os.makedirs(OUTPUT, exist_ok=True)
+
+def getConfiguration():
+    """
+    :returns a list of the mode and output of the instrumentation, to configure another process the same way
+    with configure.
+    """
+    return [MODE, OUTPUT]
+
+def addArguments(parser):
+    """
+    Adds the --profile and --profile-output options to a command line parser.
+
+    :param parser: argparse.ArgumentParser of the program.
+    """
+    parser.add_argument("--profile", choices=MODES, default=None,
+                        help="record every hint as a JSON line (stats) or as a pstats file (cprofile)")
+    parser.add_argument("--profile-output", default=None, help="file or directory the hints are recorded in")
+
+def configureFromArguments(arguments):
+    """
+    Enables the instrumentation if requested on the command line, the environment is used otherwise.
+
+    :param arguments: Arguments parsed by a parser given to addArguments.
+    """
+    if arguments.profile is not None:
+        configure(arguments.profile, arguments.profile_output)
+
+def beginTurn(game):
+    """
+    Starts recording a hint computation.
+
+    :param game: GameState the hint is computed for.
+    """
+    global TURN, PROFILER
+    boardSize = len(game.board)
+    TURN = {"pid": os.getpid(), "move": game.move, "boardSize": boardSize, "occupied": game.occupiedTiles,
+            "fill": game.occupiedTiles / boardSize ** 2, "tiles": "".join(game.currentTiles),
+            "phases": {}, "counters": {}, "start": time.perf_counter()}
+    if MODE == "cprofile":
+        PROFILER = cProfile.Profile()
+        PROFILER.enable()
+
+def addTime(phase, seconds):
+    """
+    Adds time to a phase of the turn being recorded.
+
+    :param phase: Name of the phase.
+
+    :param seconds: Time spent in the phase.
+    """
+    if TURN is not None:
+        TURN["phases"][phase] = TURN["phases"].get(phase, 0.0) + seconds
+
+def count(counter, amount=1):
+    """
+    Adds to a counter of the turn being recorded.
+
+    :param counter: Name of the counter.
+
+    :param amount: Amount to add, defaults to 1.
+    """
+    if TURN is not None:
+        TURN["counters"][counter] = TURN["counters"].get(counter, 0) + amount
+
+def endTurn(move):
+    """
+    Finishes recording the hint computation and writes it out.
+
+    :param move: Best Move found, None if there is no move.
+    """
+    global TURN, PROFILER, TURNS
+    if TURN is None:
+        return
+    turn = TURN
+    TURN = None
+    turn["seconds"] = time.perf_counter() - turn.pop("start")
+    turn["best"] = None if move is None else [move.word, move.score, move.location()]
+    TURNS += 1
+
+    if PROFILER is not None:
+        PROFILER.disable()
+        turn["pstats"] = os.path.join(OUTPUT, "turn-" + str(turn["pid"]) + "-" + str(TURNS) + ".pstats")
+        PROFILER.dump_stats(turn["pstats"])
+        PROFILER = None
+        logPath = os.path.join(OUTPUT, "turns.jsonl")
+    else:
+        logPath = OUTPUT
+
+    with open(logPath, "a") as logFile:
+        logFile.write(json.dumps(turn) + "\n")
+
+def configureFromEnvironment():
+    """
+    Enables the instrumentation if SCRABBLE_PROFILE is set. An unknown mode or an output that cannot be
+    created is reported with a warning and leaves the instrumentation off, so that it cannot stop the game.
+    """
+    try:
+        configure(os.environ.get("SCRABBLE_PROFILE") or None, os.environ.get("SCRABBLE_PROFILE_OUTPUT") or None)
+    except (ValueError, OSError) as error:
+        configure(None)
+        warnings.warn("SCRABBLE_PROFILE is ignored: " + str(error), RuntimeWarning)
+
+configureFromEnvironment()
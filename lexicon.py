@@ -0,0 +1,803 @@
+"""
+Description: Lexicon of valid words with hashed membership, prefix queries and length buckets.
+Every word also has a letter-count signature to reject words that cannot be made from the available letters.
+The lexicon can be compiled once into a binary file which is memory mapped when loaded, or published
+in shared memory for worker processes to attach to.
+The candidate words of racks can be memoized in a least recently used cache shared by many games.
+"""
+
+import array
+import bisect
+import collections
+import hashlib
+import heapq
+import itertools
+import mmap
+import multiprocessing.resource_tracker
+import multiprocessing.shared_memory
+import os
+import struct
+import sys
+import threading
+import weakref
+import zlib
+
+import dawg
+
+PREFIX_END = chr(0x10FFFF)     # Sorts after every word sharing a prefix
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ALL_LETTERS = (1 << len(ALPHABET)) - 1
+# Letter counts are compared as one integer with a byte per letter, the top bit of each byte
+# guards against borrowing from the next letter
+GUARDS = int.from_bytes(b"\x80" * len(ALPHABET), "big")
+
+# Layout of the compiled lexicon: a header, a table of named sections, then the sections
+MAGIC = b"SCRLEX\0\0"
+VERSION = 4
+BYTE_ORDER = 0x01020304         # Written natively to detect files from another platform
+HEADER = struct.Struct("=8sIIqq20sI")
+SECTION = struct.Struct("=8sQQ")
+ALIGNMENT = 8
+PUBLISHED = set()       # Names of the shared memory segments published by this process, see openSegment
+
+class Lexicon:
+    """
+    Stores the valid words in sorted order.
+    Membership is checked against a hash set, prefixes are searched with bisection on
+    the sorted words, and words are bucketed by their length.
+    """
+
+    def __init__(self, words=()):
+        """
+        :param words: Iterable of valid words, defaults to an empty lexicon.
+        """
+        self.wordSet = set()        # Hashed words for membership checks
+        self.words = []             # Sorted words
+        self.lengthBuckets = {}     # A map with lengths as keys and lists of word indexes as values
+        self.letterCounts = b""     # Count of every letter of every word, a byte per letter
+        self.letterMasks = []       # Bitmap of the letters of every word
+        self.dawg = None            # Built on first use
+        self.update(words)
+
+    def update(self, words):
+        """
+        Adds the words to the lexicon and rebuilds the sorted words and length buckets.
+
+        :param words: Iterable of words to be added.
+        """
+        self.wordSet.update(words)
+        self.words = sorted(self.wordSet)
+        self.lengthBuckets = {}
+        for index, word in enumerate(self.words):
+            self.lengthBuckets.setdefault(len(word), []).append(index)
+        self.letterCounts, self.letterMasks = buildSignatures(self.words)
+        self.dawg = None
+
+    def getBaseScores(self, scores):
+        """
+        :param scores: A map with letters as keys and scores from 0 to 255 as values.
+
+        :returns an array of the base score of every word, see buildBaseScores.
+        """
+        return buildBaseScores(self.words, scores)
+
+    def getDawg(self):
+        """
+        :returns the DAWG of the words, building it if needed.
+        """
+        if self.dawg is None:
+            self.dawg = dawg.buildDawg(self.words)
+        return self.dawg
+
+    def __contains__(self, word):
+        return word in self.wordSet
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def maxLength(self):
+        """
+        :returns the length of the longest word, 0 if the lexicon is empty.
+        """
+        return max(self.lengthBuckets, default=0)
+
+    def hasPrefix(self, prefix):
+        """
+        Determines whether any word starts with the prefix.
+
+        :param prefix: Prefix string to be checked.
+
+        :returns True if at least one word starts with the prefix.
+        """
+        index = bisect.bisect_left(self.words, prefix)
+        return index < len(self.words) and self.words[index].startswith(prefix)
+
+    def wordsWithPrefix(self, prefix):
+        """
+        :param prefix: Prefix string of the words.
+
+        :returns a list of words starting with the prefix in sorted order.
+        """
+        start = bisect.bisect_left(self.words, prefix)
+        end = bisect.bisect_left(self.words, prefix + PREFIX_END, start)
+        return self.words[start:end]
+
+    def wordsOfLength(self, length):
+        """
+        :param length: Length of the words.
+
+        :returns a list of words with the given length in sorted order.
+        """
+        return [self.words[index] for index in self.lengthBuckets.get(length, [])]
+
+    def indexesWithinLength(self, maxLength, minLength=1):
+        """
+        Generates the indexes of the words whose length is within the range in sorted order.
+        Only the length buckets within the range are visited.
+
+        :param maxLength: Maximum length of the words.
+
+        :param minLength: Minimum length of the words, defaults to 1.
+        """
+        buckets = [self.lengthBuckets[length] for length in self.lengthBuckets
+                   if minLength <= length <= maxLength]
+        return heapq.merge(*buckets)
+
+    def indexesOfLengths(self, lengths):
+        """
+        Generates the indexes of the words of the given lengths in sorted order.
+
+        :param lengths: Iterable of word lengths.
+        """
+        return heapq.merge(*[self.lengthBuckets[length] for length in lengths if length in self.lengthBuckets])
+
+    def countWithinLength(self, maxLength, minLength=1):
+        """
+        :param maxLength: Maximum length of the words.
+
+        :param minLength: Minimum length of the words, defaults to 1.
+
+        :returns the number of words whose length is within the range.
+        """
+        return sum(len(self.lengthBuckets[length]) for length in self.lengthBuckets
+                   if minLength <= length <= maxLength)
+
+    def wordsWithinLength(self, maxLength, minLength=1):
+        """
+        Generates words whose length is within the range in sorted order.
+
+        :param maxLength: Maximum length of the words.
+
+        :param minLength: Minimum length of the words, defaults to 1.
+        """
+        for index in self.indexesWithinLength(maxLength, minLength):
+            yield self.words[index]
+
+    def candidateIndexes(self, available, maxLength, minLength=1, extra=0, indexes=None):
+        """
+        Generates the indexes of the words that can be made from the available letters in sorted order.
+        Words missing too many letters are rejected with their letter bitmap, the remaining ones
+        by comparing all their letter counts in one integer subtraction.
+
+        :param available: A map with letters as keys and their available counts as values.
+
+        :param maxLength: Maximum length of the words.
+
+        :param minLength: Minimum length of the words, defaults to 1.
+
+        :param extra: Number of letters a word may use beyond the available ones, defaults to 0.
+
+        :param indexes: Sorted word indexes to be checked, defaults to None for all the words within the lengths.
+        """
+        counts, mask = getSignature(available)
+        missing = ALL_LETTERS & ~mask
+        availableCounts = int.from_bytes(bytes(min(count, 0x7F) | 0x80 for count in counts), "big")
+        letterCounts = self.letterCounts
+        letterMasks = self.letterMasks
+        width = len(ALPHABET)
+        if indexes is None:
+            indexes = self.indexesWithinLength(maxLength, minLength)
+
+        for index in indexes:
+            if extra == 0:
+                if letterMasks[index] & missing:
+                    continue
+            elif bin(letterMasks[index] & missing).count("1") > extra:
+                continue
+            wordCounts = int.from_bytes(letterCounts[index * width:(index + 1) * width], "big")
+            remaining = availableCounts - wordCounts
+            if remaining & GUARDS == GUARDS:
+                yield index
+
+            # A cleared guard leaves 0x80 minus the number of letters missing in its byte
+            elif extra > 0 and sum(0x80 - count for count in remaining.to_bytes(width, "big")
+                                   if count < 0x80) <= extra:
+                yield index
+
+    def candidates(self, available, maxLength, minLength=1, extra=0):
+        """
+        Generates the words that can be made from the available letters in sorted order, see candidateIndexes.
+
+        :param available: A map with letters as keys and their available counts as values.
+
+        :param maxLength: Maximum length of the words.
+
+        :param minLength: Minimum length of the words, defaults to 1.
+
+        :param extra: Number of letters a word may use beyond the available ones, defaults to 0.
+        """
+        words = self.words
+        for index in self.candidateIndexes(available, maxLength, minLength, extra):
+            yield words[index]
+
+class PackedWords:
+    """
+    Read-only sequence of the words packed in a compiled lexicon.
+    Words are decoded on access so that only the offset table and the packed bytes are kept.
+    """
+
+    def __init__(self, data, offsets):
+        """
+        :param data: Buffer with the words packed one after another.
+
+        :param offsets: Sequence with the start of every word followed by the end of the last word.
+        """
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Word index out of range!")
+        return str(self.data[self.offsets[index]:self.offsets[index + 1]], "ascii")
+
+def releaseViews(views, owner=None):
+    """
+    Releases the views of a buffer, then closes the object holding it, which cannot be closed while
+    views of its buffer remain.
+
+    :param views: List of memoryviews.
+
+    :param owner: Object holding the buffer, such as a shared memory segment, defaults to None.
+    """
+    for view in views:
+        view.release()
+    if owner is not None:
+        owner.close()
+
+class PackedLexicon(Lexicon):
+    """
+    Read-only lexicon over the sections of a compiled lexicon.
+    Membership is checked in the hash table of the packed words, see buildHashTable.
+    """
+
+    def __init__(self, sections, owner=None):
+        """
+        :param sections: A map with section names as keys and buffers as values, see readSections.
+
+        :param owner: Object holding the buffer of the sections, such as a shared memory segment,
+        closed once the sections are released, defaults to None.
+        """
+        self.owner = owner
+        self.sections = sections
+        self.words = PackedWords(sections["WORDS"], sections["OFFSETS"].cast("I"))
+        lengthIndexes = sections["LENGTHS"].cast("I")
+        lengthStarts = sections["LENSTART"].cast("I")
+        self.lengthBuckets = {}
+        for length in range(len(lengthStarts) - 1):
+            if lengthStarts[length] < lengthStarts[length + 1]:
+                self.lengthBuckets[length] = lengthIndexes[lengthStarts[length]:lengthStarts[length + 1]]
+        self.letterCounts = sections["COUNTS"]
+        self.letterMasks = sections["MASKS"].cast("I")
+        self.hashTable = sections["HASHES"].cast("I")
+        self.dawg = dawg.fromSections(sections)
+        # Base scores are only published with a shared lexicon, for the score table they were added up with
+        self.scoreTable = sections.get("SCORES")
+        self.baseScores = sections["BASES"].cast("I") if "BASES" in sections else None
+        # The views are released before the owner is closed, when the lexicon is closed, collected or at exit
+        views = list(sections.values()) + list(self.lengthBuckets.values()) + \
+            [self.words.offsets, self.letterMasks, self.hashTable, self.dawg.edgeStarts, self.dawg.edgeTargets]
+        if self.baseScores is not None:
+            views.append(self.baseScores)
+        self.finalizer = weakref.finalize(self, releaseViews, views, owner)
+
+    def close(self):
+        """
+        Releases the views of the sections and closes their owner. The lexicon cannot be used afterwards.
+        """
+        self.finalizer()
+
+    def update(self, words):
+        raise TypeError("A compiled lexicon is read-only!")
+
+    def getBaseScores(self, scores):
+        """
+        :param scores: A map with letters as keys and scores from 0 to 255 as values.
+
+        :returns the base scores published with the lexicon if they were added up with the same scores,
+        or an array of the base score of every word otherwise, see buildBaseScores.
+        """
+        if self.baseScores is not None and self.scoreTable == getScoreTable(scores):
+            return self.baseScores
+        return buildBaseScores(self.words, scores)
+
+    def __contains__(self, word):
+        try:
+            target = word.encode("ascii")
+        except UnicodeEncodeError:
+            return False
+        data = self.words.data
+        offsets = self.words.offsets
+        mask = len(self.hashTable) - 1
+        slot = zlib.crc32(target) & mask
+        # Slots are probed in turn until the word or an empty slot is found
+        while self.hashTable[slot]:
+            end = offsets[self.hashTable[slot]]
+            start = offsets[self.hashTable[slot] - 1]
+            if end - start == len(target) and data[start:end] == target:
+                return True
+            slot = (slot + 1) & mask
+        return False
+
+    def __iter__(self):
+        for index in range(len(self.words)):
+            yield self.words[index]
+
+class CandidateCache:
+    """
+    Least recently used cache of the candidate words of racks, shared by the games of an engine.
+    Racks are keyed by their sorted letters so that the same tiles in any order hit the same entry.
+    """
+
+    def __init__(self, words, size=1024, maxExtra=2):
+        """
+        :param words: Lexicon the candidates are taken from.
+
+        :param size: Maximum number of racks kept, defaults to 1024.
+
+        :param maxExtra: Maximum number of board letters the candidates of a rack may use, defaults to 2.
+        Beyond a few letters nearly every word of the lexicon is a candidate and a sweep is as fast.
+        """
+        assert size > 0, "Cache size should be positive!"
+        self.words = words
+        self.size = size
+        self.maxExtra = maxExtra
+        # A map with [sorted rack, extra] as keys and lists of the word indexes of every length as values
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()                # Guards the entries and counters across threads
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def candidateIndexes(self, currentTiles, maxLength, extra=0):
+        """
+        Generates the indexes of the words that can be made from the rack with at most extra more letters
+        in sorted order, see Lexicon.candidateIndexes.
+        Racks are cached with the candidates of every length, which are only filtered by length after the lookup.
+
+        :param currentTiles: List of tiles in the rack.
+
+        :param maxLength: Maximum length of the words.
+
+        :param extra: Number of board letters a word may use beyond the rack, defaults to 0.
+
+        :raises ValueError if extra is more than maxExtra.
+        """
+        if extra > self.maxExtra:
+            raise ValueError("At most " + str(self.maxExtra) + " extra letters are cached!")
+        key = ("".join(sorted(currentTiles)), extra)
+        with self.lock:
+            buckets = self.entries.get(key)
+            if buckets is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        # Computed outside the lock, a rack missed by two threads at once is swept twice
+        if buckets is None:
+            available = collections.Counter(currentTiles)
+            buckets = [tuple(self.words.candidateIndexes(available, length, length, extra))
+                       for length in range(len(currentTiles) + extra + 1)]
+            with self.lock:
+                self.entries[key] = buckets
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.size:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+        return heapq.merge(*buckets[1:maxLength + 1])
+
+    def candidates(self, currentTiles, maxLength, extra=0):
+        """
+        :returns a list of the words of candidateIndexes.
+        """
+        words = self.words.words
+        return [words[index] for index in self.candidateIndexes(currentTiles, maxLength, extra)]
+
+    def clear(self):
+        """
+        Forgets every rack, the counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        :returns a map with the number of racks kept, the maximum size, and the hits, misses and evictions so far.
+        """
+        with self.lock:
+            return {"entries": len(self.entries), "size": self.size, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+def getSignature(letters):
+    """
+    :param letters: A word, a list of letters or a map with letters as keys and counts as values.
+
+    :returns a list of the count of every letter of the alphabet and a bitmap of the letters present.
+    """
+    if not isinstance(letters, dict):
+        letters = collections.Counter(letters)
+    counts = [0] * len(ALPHABET)
+    mask = 0
+    for letter, count in letters.items():
+        position = ord(letter) - ord("A")
+        if count > 0 and 0 <= position < len(ALPHABET):
+            counts[position] += count
+            mask |= 1 << position
+    return counts, mask
+
+def buildSignatures(words):
+    """
+    :param words: List of words.
+
+    :returns the letter counts of the words packed a byte per letter, and an array of their letter bitmaps.
+    """
+    letterCounts = bytearray()
+    letterMasks = array.array("I")
+    for word in words:
+        counts, mask = getSignature(word)
+        letterCounts.extend(counts)
+        letterMasks.append(mask)
+    return bytes(letterCounts), letterMasks
+
+def getScoreTable(scores):
+    """
+    :param scores: A map with letters as keys and scores from 0 to 255 as values.
+
+    :returns the score of every letter code as bytes.
+    """
+    table = bytearray(256)
+    for letter, score in scores.items():
+        table[ord(letter)] = score
+    return bytes(table)
+
+def buildBaseScores(words, scores):
+    """
+    Adds up the letter scores of every word at once, from running totals over the packed letters.
+
+    :param words: List of words, or the PackedWords of a compiled lexicon.
+
+    :param scores: A map with letters as keys and scores from 0 to 255 as values.
+
+    :returns an array of the base score of every word, the score of all its letters, indexed like the words.
+    """
+    if isinstance(words, PackedWords):
+        data, offsets = bytes(words.data), words.offsets
+    else:
+        data = "".join(words).encode("ascii")
+        offsets = [0, *itertools.accumulate(len(word) for word in words)]
+    totals = array.array("Q", [0, *itertools.accumulate(data.translate(getScoreTable(scores)))])
+    return array.array("I", [totals[offsets[i + 1]] - totals[offsets[i]] for i in range(len(offsets) - 1)])
+
+def getSourceStamp(textPath, withDigest=True):
+    """
+    :param textPath: Path of the source text file.
+
+    :param withDigest: Whether to hash the content of the file, defaults to True.
+
+    :returns a list with the modification time, size and SHA-1 digest of the file.
+    """
+    status = os.stat(textPath)
+    digest = b""
+    if withDigest:
+        with open(textPath, "rb") as textFile:
+            digest = hashlib.sha1(textFile.read()).digest()
+    return [status.st_mtime_ns, status.st_size, digest]
+
+def packSections(stamp, sections):
+    """
+    :param stamp: Source stamp from getSourceStamp.
+
+    :param sections: List of [name, bytes] with names of at most 8 characters.
+
+    :returns the compiled lexicon as bytes: the header, the table of sections, then the aligned sections.
+    """
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for name, data in sections:
+        offset += -offset % ALIGNMENT
+        table.append(SECTION.pack(name.encode("ascii"), offset, len(data)))
+        offset += len(data)
+
+    image = bytearray(HEADER.pack(MAGIC, VERSION, BYTE_ORDER, stamp[0], stamp[1], stamp[2], len(sections)))
+    image += b"".join(table)
+    for name, data in sections:
+        image += b"\0" * (-len(image) % ALIGNMENT)
+        image += data
+    return bytes(image)
+
+def writeSections(binaryPath, stamp, sections):
+    """
+    Writes the named sections into a binary file, see packSections.
+    The file is written under a temporary name and then renamed so that readers never see it partially written.
+
+    :param binaryPath: Path of the binary file.
+
+    :param stamp: Source stamp from getSourceStamp.
+
+    :param sections: List of [name, bytes] with names of at most 8 characters.
+    """
+    temporaryPath = binaryPath + ".tmp" + str(os.getpid())
+    with open(temporaryPath, "wb") as binaryFile:
+        binaryFile.write(packSections(stamp, sections))
+    os.replace(temporaryPath, binaryPath)
+
+def readHeader(binaryFile):
+    """
+    :param binaryFile: Binary file opened for reading, positioned at its start.
+
+    :returns the unpacked header, or None if the file is not a compiled lexicon of the current version.
+    """
+    header = binaryFile.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    header = HEADER.unpack(header)
+    if header[0] != MAGIC or header[1] != VERSION or header[2] != BYTE_ORDER:
+        return None
+    return header
+
+def readSections(buffer):
+    """
+    :param buffer: Buffer holding a compiled lexicon, usually memory mapped.
+
+    :returns a map with section names as keys and zero-copy memoryviews as values.
+    """
+    view = memoryview(buffer)
+    sectionCount = HEADER.unpack_from(view)[6]
+    sections = {}
+    for i in range(sectionCount):
+        name, offset, length = SECTION.unpack_from(view, HEADER.size + SECTION.size * i)
+        sections[name.rstrip(b"\0").decode("ascii")] = view[offset:offset + length]
+    return sections
+
+def buildHashTable(words):
+    """
+    Builds an open addressing hash table of the words, at most half full. Every word is stored in the first
+    free slot from the CRC-32 of its letters, which stays the same across processes, as its index plus one
+    so that 0 marks an empty slot.
+
+    :param words: List of sorted unique words.
+
+    :returns the table as an array of unsigned ints, of a power of two length.
+    """
+    size = 1
+    while size < 2 * len(words):
+        size *= 2
+    table = array.array("I", bytes(4 * size))
+    for index, word in enumerate(words):
+        slot = zlib.crc32(word.encode("ascii")) & (size - 1)
+        while table[slot]:
+            slot = (slot + 1) & (size - 1)
+        table[slot] = index + 1
+    return table
+
+def buildSections(words):
+    """
+    Packs the sorted words with their offset table, hash table, length buckets, letter signatures and DAWG.
+
+    :param words: List of sorted unique words.
+
+    :returns a list of [name, bytes] sections.
+    """
+    offsets = array.array("I", [0])
+    for word in words:
+        offsets.append(offsets[-1] + len(word))
+
+    maxLength = max((len(word) for word in words), default=0)
+    buckets = [[] for _ in range(maxLength + 1)]
+    for index, word in enumerate(words):
+        buckets[len(word)].append(index)
+    lengthIndexes = array.array("I")
+    lengthStarts = array.array("I", [0])
+    for bucket in buckets:
+        lengthIndexes.extend(bucket)
+        lengthStarts.append(len(lengthIndexes))
+
+    letterCounts, letterMasks = buildSignatures(words)
+
+    return [["WORDS", "".join(words).encode("ascii")],
+            ["OFFSETS", offsets.tobytes()],
+            ["HASHES", buildHashTable(words).tobytes()],
+            ["LENGTHS", lengthIndexes.tobytes()],
+            ["LENSTART", lengthStarts.tobytes()],
+            ["COUNTS", letterCounts],
+            ["MASKS", letterMasks.tobytes()]] + dawg.buildDawg(words).toSections()
+
+def readWords(textPath):
+    """
+    :param textPath: Path of the text file with one word per line.
+
+    :returns a list of the sorted unique words.
+    """
+    textFile = open(textPath)
+    words = sorted(set(line.strip() for line in textFile) - {""})
+    textFile.close()
+    return words
+
+def compileLexicon(textPath, binaryPath):
+    """
+    Compiles the words in the text file into a binary lexicon.
+
+    :param textPath: Path of the text file with one word per line.
+
+    :param binaryPath: Path of the binary file to be written.
+    """
+    stamp = getSourceStamp(textPath)
+    writeSections(binaryPath, stamp, buildSections(readWords(textPath)))
+
+def lexiconIsCurrent(textPath, binaryPath):
+    """
+    Determines whether the binary lexicon was compiled from the current text file.
+    The content is only hashed when the modification time or size has changed, and the stored
+    modification time is refreshed if the content turns out to be the same and the file can be written.
+
+    :param textPath: Path of the text file with one word per line.
+
+    :param binaryPath: Path of the binary lexicon.
+
+    :returns True if the binary lexicon can be used as it is.
+    """
+    try:
+        binaryFile = open(binaryPath, "rb")
+    except OSError:
+        return False
+
+    with binaryFile:
+        header = readHeader(binaryFile)
+    if header is None:
+        return False
+    stamp = getSourceStamp(textPath, withDigest=False)
+    if header[3:5] == tuple(stamp[:2]):
+        return True
+
+    stamp = getSourceStamp(textPath)
+    if header[4:6] != tuple(stamp[1:]):
+        return False
+    # A read-only lexicon is still current, its content is hashed again on the next load
+    try:
+        with open(binaryPath, "r+b") as binaryFile:
+            binaryFile.write(HEADER.pack(*header[:3], stamp[0], *header[4:]))
+    except OSError:
+        pass
+    return True
+
+def openLexicon(binaryPath):
+    """
+    Memory maps a binary lexicon.
+
+    :param binaryPath: Path of the binary lexicon.
+
+    :returns a PackedLexicon backed by the mapped file.
+    """
+    with open(binaryPath, "rb") as binaryFile:
+        buffer = mmap.mmap(binaryFile.fileno(), 0, access=mmap.ACCESS_READ)
+    return PackedLexicon(readSections(buffer))
+
+def loadLexicon(textPath, binaryPath=None):
+    """
+    Loads the lexicon from its binary form, compiling it first if it is missing or out of date.
+    Falls back to reading the text file into memory if the binary lexicon cannot be written.
+
+    :param textPath: Path of the text file with one word per line.
+
+    :param binaryPath: Path of the binary lexicon, defaults to the text file path with a ".lex" extension.
+
+    :returns a PackedLexicon, or a Lexicon if the binary lexicon is unavailable.
+    """
+    if binaryPath is None:
+        binaryPath = os.path.splitext(textPath)[0] + ".lex"
+
+    try:
+        if not lexiconIsCurrent(textPath, binaryPath):
+            compileLexicon(textPath, binaryPath)
+        return openLexicon(binaryPath)
+    except OSError as message:
+        print("Unable to use the compiled lexicon: " + str(message), file=sys.stderr)
+        return Lexicon(readWords(textPath))
+
+def shareLexicon(textPath, binaryPath=None, scores=None):
+    """
+    Publishes the compiled lexicon in a shared memory segment, for processes that cannot rely on
+    a mapped file, see attachLexicon. The compiled lexicon is copied if it is current, and built in
+    memory otherwise so that no file has to be written.
+    With a score map, the base scores of the words are published along, so that the processes attached
+    to the segment do not add them up again, see PackedLexicon.getBaseScores.
+    The segment is owned by the caller, which should close and unlink it once the processes are done.
+
+    :param textPath: Path of the text file with one word per line.
+
+    :param binaryPath: Path of the binary lexicon, defaults to the text file path with a ".lex" extension.
+
+    :param scores: A map with letters as keys and scores from 0 to 255 as values, defaults to None.
+
+    :returns the multiprocessing.shared_memory.SharedMemory holding the compiled lexicon.
+    """
+    if binaryPath is None:
+        binaryPath = os.path.splitext(textPath)[0] + ".lex"
+
+    image = None
+    if lexiconIsCurrent(textPath, binaryPath):
+        try:
+            with open(binaryPath, "rb") as binaryFile:
+                image = binaryFile.read()
+        except OSError:
+            pass
+    if image is None:
+        image = packSections(getSourceStamp(textPath), buildSections(readWords(textPath)))
+    if scores is not None:
+        sections = readSections(image)
+        words = PackedWords(sections["WORDS"], sections["OFFSETS"].cast("I"))
+        stamp = HEADER.unpack_from(image)[3:6]
+        image = packSections(stamp, [[name, bytes(view)] for name, view in sections.items()] +
+                             [["SCORES", getScoreTable(scores)],
+                              ["BASES", buildBaseScores(words, scores).tobytes()]])
+
+    segment = multiprocessing.shared_memory.SharedMemory(create=True, size=len(image))
+    segment.buf[:len(image)] = image
+    PUBLISHED.add(segment.name)
+    return segment
+
+def openSegment(name):
+    """
+    Opens an existing shared memory segment, which is then unregistered from the resource tracker
+    of the process. A registered segment is unlinked when the process exits, even though it belongs
+    to the process that published it. The segments published by this process are left registered.
+
+    :param name: Name of the shared memory segment.
+
+    :returns the multiprocessing.shared_memory.SharedMemory of the segment.
+
+    :raises FileNotFoundError if there is no segment of that name.
+    """
+    segment = multiprocessing.shared_memory.SharedMemory(name)
+    if segment.name not in PUBLISHED:
+        multiprocessing.resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+def attachLexicon(name):
+    """
+    Attaches to a lexicon published with shareLexicon. The sections are views of the segment,
+    so every process attached to it shares the same memory instead of holding its own copy.
+
+    :param name: Name of the shared memory segment.
+
+    :returns a PackedLexicon backed by the segment, which it keeps open until it is closed.
+
+    :raises FileNotFoundError if there is no segment of that name.
+
+    :raises ValueError if the segment does not hold a compiled lexicon of the current version.
+    """
+    segment = openSegment(name)
+    if segment.size < HEADER.size or HEADER.unpack_from(segment.buf)[:3] != (MAGIC, VERSION, BYTE_ORDER):
+        segment.close()
+        raise ValueError("The shared memory segment " + name + " does not hold a compiled lexicon!")
+    return PackedLexicon(readSections(segment.buf), segment)
@@ -0,0 +1,620 @@
+"""
+Description: Move generation by walking the lexicon DAWG from anchor squares, or by scanning
+the lexicon words that the rack and the board letters can make.
+A move places a word along a row or column so that every empty cell is filled with a tile
+from the rack and every occupied cell matches the letter of the word, using at least one
+existing tile after the first move. Only the lines holding tiles and the DAWG paths allowed
+by the rack and the board letters are visited.
+"""
+
+import collections
+import heapq
+import time
+
+import dawg
+import instrument
+import sparseboard
+
+HORIZONTAL = "H"
+VERTICAL = "V"
+
+class Move(collections.namedtuple("Move", ["word", "row", "col", "direction", "score"])):
+    """
+    A legal move with the 0-based coordinates of the first letter of the word.
+    """
+    __slots__ = ()
+
+    def location(self):
+        """
+        :returns the location string of the move in the form of "_:_:H" or "_:_:V".
+        """
+        return str(self.row + 1) + ":" + str(self.col + 1) + ":" + self.direction
+
+def moveKey(move):
+    """
+    Orders moves by descending score, then by word, row, column and direction.
+    The best move is the smallest one, which keeps the first word in dictionary order on ties.
+
+    :param move: Move to be ordered.
+
+    :returns a tuple to sort or compare moves with.
+    """
+    return (-move.score, move.word, move.row, move.col, move.direction)
+
+def getLines(board, index=None):
+    """
+    Generates the rows and columns of the board with letter codes, 0 for empty cells.
+    With a board index, only the rows and columns holding tiles are generated.
+
+    :param board: Board as a list of rows of letters, "" for empty cells.
+
+    :param index: BoardIndex of the board, defaults to None to generate every line.
+
+    :returns tuples of direction, line index, list of letter codes and 0-based position of the first cell,
+    which is always 0 as whole lines are generated.
+    """
+    for i in range(len(board)):
+        if index is None or index.rowMasks[i]:
+            yield HORIZONTAL, i, [ord(letter) if letter else 0 for letter in board[i]], 0
+    for j in range(len(board)):
+        if index is None or index.colMasks[j]:
+            yield VERTICAL, j, [ord(board[i][j]) if board[i][j] else 0 for i in range(len(board))], 0
+
+def scoreTable(scores):
+    """
+    :param scores: A map with letters as keys and scores as values.
+
+    :returns a list of scores indexed by letter code.
+    """
+    table = [0] * 128
+    for letter, score in scores.items():
+        table[ord(letter)] = score
+    return table
+
+def rackTable(currentTiles):
+    """
+    :param currentTiles: List of tiles in the rack.
+
+    :returns a list of tile counts indexed by letter code.
+    """
+    counts = [0] * 128
+    for letter in currentTiles:
+        counts[ord(letter)] += 1
+    return counts
+
+def generateLineMoves(line, graph, rack, rackSize, scores, firstMove):
+    """
+    Generates the words that can be placed along one line.
+    Every start position within reach of an anchor (an occupied cell) is extended through
+    the DAWG, taking the board letter on occupied cells and a rack tile on empty cells.
+    On the first move the line is empty and words are only started from its first cell.
+
+    :param line: List of letter codes of the line, 0 for empty cells.
+
+    :param graph: Dawg of the lexicon.
+
+    :param rack: List of tile counts indexed by letter code, restored after the walk.
+
+    :param rackSize: Number of tiles in the rack.
+
+    :param scores: List of scores indexed by letter code.
+
+    :param firstMove: Boolean of whether the current turn is the first move.
+
+    :returns tuples of start position, word and score.
+    """
+    length = len(line)
+    edgeStarts = graph.edgeStarts
+    edgeLetters = graph.edgeLetters
+    edgeTargets = graph.edgeTargets
+    terminals = graph.terminals
+    letters = []
+
+    def extend(position, node, placed, anchored, score):
+        if position == length:
+            return
+        cell = line[position]
+
+        if cell:
+            edge = edgeLetters.find(cell, edgeStarts[node], edgeStarts[node + 1])
+            if edge < 0:
+                return
+            child = edgeTargets[edge]
+            letters.append(cell)
+            if placed and terminals[child]:
+                yield bytes(letters).decode("ascii"), score
+            yield from extend(position + 1, child, placed, True, score)
+            letters.pop()
+            return
+
+        if placed == rackSize:
+            return
+        for edge in range(edgeStarts[node], edgeStarts[node + 1]):
+            letter = edgeLetters[edge]
+            if not rack[letter]:
+                continue
+            child = edgeTargets[edge]
+            rack[letter] -= 1
+            letters.append(letter)
+            if (anchored or firstMove) and terminals[child]:
+                yield bytes(letters).decode("ascii"), score + scores[letter]
+            yield from extend(position + 1, child, placed + 1, anchored, score + scores[letter])
+            letters.pop()
+            rack[letter] += 1
+
+    # Position of the nearest anchor at or after every cell
+    nextAnchor = [length] * (length + 1)
+    for position in range(length - 1, -1, -1):
+        nextAnchor[position] = position if line[position] else nextAnchor[position + 1]
+
+    tried = 0
+    for start in range(1 if firstMove else length):
+        # The empty cells before the anchor must be filled from the rack
+        if not firstMove and nextAnchor[start] - start > rackSize:
+            continue
+        tried += 1
+        for word, score in extend(start, dawg.ROOT, 0, False, 0):
+            yield start, word, score
+
+    if instrument.ENABLED:
+        instrument.count("startsTried", tried)
+        instrument.count("startsPruned", (1 if firstMove else length) - tried)
+
+def rackSubsets(currentTiles, scores):
+    """
+    :param currentTiles: List of tiles in the rack.
+
+    :param scores: List of scores indexed by letter code.
+
+    :returns a list of tuples of the sorted letter codes as bytes and the score of every set of tiles the rack
+    can place, see LineMoveCache.
+    """
+    counts = sorted(collections.Counter(ord(letter) for letter in currentTiles).items())
+    subsets = [(b"", 0)]
+    for letter, count in counts:
+        subsets = [(taken + bytes([letter]) * used, score + scores[letter] * used)
+                   for taken, score in subsets for used in range(count + 1)]
+    return [subset for subset in subsets if subset[0]]
+
+def getAnchorLines(board, firstMove, index=None, reach=None):
+    """
+    :param board: Board as a list of rows of letters, "" for empty cells, or a sparseboard.SparseBoard.
+
+    :param firstMove: Boolean of whether the current turn is the first move.
+
+    :param index: BoardIndex of the board to skip empty lines without scanning them, defaults to None.
+
+    :param reach: Number of tiles in the rack, defaults to None for no limit. A sparse board only
+    yields the windows of its lines within reach of their tiles, see sparseboard.SparseBoard.segments.
+
+    :returns a list of the lines holding tiles as returned by getLines, or only the first row on the first move.
+    """
+    if firstMove:
+        return [(HORIZONTAL, 0, [0] * min(len(board), len(board) if reach is None else reach), 0)]
+    if isinstance(board, sparseboard.SparseBoard):
+        return board.anchorLines(len(board) if reach is None else reach)
+    return [line for line in getLines(board, index) if any(line[2])]
+
+def walkLines(lines, currentTiles, firstMove, graph, scores, cache=None):
+    """
+    Generates the moves along the lines.
+
+    :param lines: List of lines as returned by getAnchorLines.
+
+    :param currentTiles: List of tiles to be used in the current turn.
+
+    :param firstMove: Boolean of whether the current turn is the first move.
+
+    :param graph: Dawg of the lexicon.
+
+    :param scores: A map with letters as keys and scores as values.
+
+    :param cache: LineMoveCache of the board to take the placements of unchanged lines from, defaults to None
+    to walk every line. It is only used after the first move and for racks within its reach, on lines cut
+    for its reach, see generateMoves.
+
+    :returns Move objects in no particular order.
+    """
+    rack = rackTable(currentTiles)
+    scores = scoreTable(scores)
+    subsets = rackSubsets(currentTiles, scores) if cache is not None else None
+    for direction, lineIndex, line, offset in lines:
+        if cache is not None:
+            # Every placement taking the same tiles has the score of these tiles
+            placements = cache.linePlacements(direction, lineIndex, offset, line, currentTiles, graph, scores)
+            lineMoves = [(start, word, score) for taken, score in subsets for start, word in placements.get(taken, ())]
+        else:
+            lineMoves = generateLineMoves(line, graph, rack, len(currentTiles), scores, firstMove)
+        for start, word, score in lineMoves:
+            if direction == HORIZONTAL:
+                yield Move(word, lineIndex, offset + start, direction, score)
+            else:
+                yield Move(word, offset + start, lineIndex, direction, score)
+
+def generateMoves(board, currentTiles, firstMove, graph, scores, index=None, cache=None, candidateCache=None,
+                  baseScores=None):
+    """
+    Generates every legal move for the current tiles.
+    On the first move the board is empty and words are only placed from "1:1:H". With a candidate cache,
+    they are the candidate words of the rack instead of the words found along the first row, scored with
+    their base scores if given, see firstMoves.
+
+    :param board: Board as a list of rows of letters, "" for empty cells, or a sparseboard.SparseBoard.
+
+    :param currentTiles: List of tiles to be used in the current turn.
+
+    :param firstMove: Boolean of whether the current turn is the first move.
+
+    :param graph: Dawg of the lexicon.
+
+    :param scores: A map with letters as keys and scores as values.
+
+    :param index: BoardIndex of the board to skip empty lines without scanning them, defaults to None.
+
+    :param cache: LineMoveCache of the board to take the placements of unchanged lines from, defaults to None
+    to walk every line, see walkLines.
+
+    :param candidateCache: lexicon.CandidateCache of the lexicon to take the first move from, defaults to None.
+
+    :param baseScores: Array of the score of all the letters of every word, see lexicon.buildBaseScores.
+    Defaults to None to add up the scores of the letters of every word of the first move.
+
+    :returns Move objects in no particular order.
+    """
+    if firstMove and candidateCache is not None:
+        yield from firstMoves(board, currentTiles, candidateCache.words, scores, candidateCache, baseScores)
+        return
+
+    # The lines are cut for the reach of the cache, so that their windows stay the same for any rack
+    if cache is not None and (firstMove or len(currentTiles) > cache.reach):
+        cache = None
+    reach = len(currentTiles) if cache is None else cache.reach
+
+    if not instrument.ENABLED:
+        yield from walkLines(getAnchorLines(board, firstMove, index, reach), currentTiles, firstMove, graph, scores,
+                             cache)
+        return
+
+    started = time.perf_counter()
+    lines = getAnchorLines(board, firstMove, index, reach)
+    instrument.addTime("lines", time.perf_counter() - started)
+    instrument.count("linesScanned", len(lines))
+    instrument.count("cellsScanned", sum(len(line[2]) for line in lines))
+
+    # The walk includes the time taken by the caller to consume the moves
+    started = time.perf_counter()
+    found = 0
+    for move in walkLines(lines, currentTiles, firstMove, graph, scores, cache):
+        found += 1
+        yield move
+    instrument.addTime("walk", time.perf_counter() - started)
+    instrument.count("movesFound", found)
+
+class LineMoveCache:
+    """
+    Caches the placements found along every line, keyed by the letters of the line only and filed under the
+    tiles they take from the rack, so that any rack holding these tiles finds them by lookups.
+    A line is walked with the rack the first time it is seen and whenever the rack holds tiles that no
+    earlier walk of the line had, the placements found being added to those of the earlier racks.
+    A placement only changes its own line and the crossing lines of the tiles it placed, so the other
+    lines keep their placements from turn to turn.
+    """
+
+    def __init__(self, reach):
+        """
+        :param reach: Largest number of tiles in a rack.
+        """
+        self.reach = reach
+        # A map with [direction, line index] as keys and maps with the first cell of the window of the line
+        # walked as keys and [letters, racks walked, placements] as values, whole lines being a single window
+        # from 0. The placements are a map with the sorted letter codes of the tiles taken as bytes keys and
+        # lists of tuples of start position and word as values.
+        self.lines = {}
+        self.hits = 0       # Lines answered from the cache
+        self.misses = 0     # Lines walked
+
+    def invalidate(self, direction, lineIndex):
+        """
+        Forgets the moves of a line.
+
+        :param direction: HORIZONTAL or VERTICAL.
+
+        :param lineIndex: 0-based index of the row or column.
+        """
+        self.lines.pop((direction, lineIndex), None)
+
+    def invalidatePlacement(self, row, col, direction, length):
+        """
+        Forgets the moves of the lines touched by a placement.
+
+        :param row: 0-based row of the first letter.
+
+        :param col: 0-based column of the first letter.
+
+        :param direction: HORIZONTAL or VERTICAL.
+
+        :param length: Length of the word placed.
+        """
+        if direction == HORIZONTAL:
+            self.invalidate(HORIZONTAL, row)
+            for j in range(col, col + length):
+                self.invalidate(VERTICAL, j)
+        else:
+            self.invalidate(VERTICAL, col)
+            for i in range(row, row + length):
+                self.invalidate(HORIZONTAL, i)
+
+    def clear(self):
+        """
+        Forgets the moves of every line.
+        """
+        self.lines.clear()
+
+    def linePlacements(self, direction, lineIndex, offset, line, currentTiles, graph, scores):
+        """
+        :param direction: HORIZONTAL or VERTICAL.
+
+        :param lineIndex: 0-based index of the row or column.
+
+        :param offset: 0-based position of the first cell of the line, see getAnchorLines.
+
+        :param line: List of letter codes of the line, 0 for empty cells.
+
+        :param currentTiles: List of tiles to be used in the current turn, after the first move.
+
+        :param graph: Dawg of the lexicon.
+
+        :param scores: List of scores indexed by letter code.
+
+        :returns a map with the sorted letter codes of the tiles taken as bytes keys, and lists of tuples of start
+        position and word as values, holding every placement along the line that takes tiles of the rack.
+        """
+        windows = self.lines.setdefault((direction, lineIndex), {})
+        letters = bytes(line)
+        rack = collections.Counter(currentTiles)
+        entry = windows.get(offset)
+        if entry is None or entry[0] != letters:
+            entry = windows[offset] = [letters, [], {}]
+
+        # The placements taking tiles of a rack walked before are all known
+        if any(not rack - walked for walked in entry[1]):
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        found = {}
+        for start, word, score in generateLineMoves(line, graph, rackTable(currentTiles), len(currentTiles), scores,
+                                                    False):
+            taken = bytes(sorted(ord(word[k]) for k in range(len(word)) if not line[start + k]))
+            found.setdefault(taken, []).append((start, word))
+        # Tiles taken by an earlier rack were filed with all their placements already
+        for taken, placements in found.items():
+            entry[2].setdefault(taken, placements)
+        entry[1].append(rack)
+        return entry[2]
+
+def bestMove(moves):
+    """
+    :param moves: Iterable of moves.
+
+    :returns the move with the maximum score as ordered by moveKey, None if there is no move.
+    """
+    return min(moves, key=moveKey, default=None)
+
+def topMoves(moves, count, minScore=None):
+    """
+    Keeps the best moves in a heap of at most count moves while the moves are consumed.
+
+    :param moves: Iterable of moves.
+
+    :param count: Maximum number of moves to be returned.
+
+    :param minScore: Minimum score of the moves, defaults to None for any score.
+
+    :returns a list of the best moves as ordered by moveKey, best first.
+    """
+    if minScore is not None:
+        moves = (move for move in moves if move.score >= minScore)
+    return heapq.nsmallest(count, moves, key=moveKey)
+
+def anyMove(moves):
+    """
+    Stops the moves at the first one, the remaining ones are never generated.
+
+    :param moves: Iterable of moves.
+
+    :returns the first move, None if there is no move.
+    """
+    return next(iter(moves), None)
+
+def getPlacementScore(board, word, row, col, direction, rack, scores, baseScore=None):
+    """
+    Checks a placement of the word against the board and the rack.
+
+    :param board: Board as a list of rows of letters, "" for empty cells.
+
+    :param word: Word to be placed.
+
+    :param row: 0-based row of the first letter.
+
+    :param col: 0-based column of the first letter.
+
+    :param direction: HORIZONTAL or VERTICAL.
+
+    :param rack: List of tile counts indexed by letter code, restored before returning.
+
+    :param scores: List of scores indexed by letter code.
+
+    :param baseScore: Score of all the letters of the word, defaults to None to add up the tiles placed.
+    With it, only the scores of the existing tiles are taken off.
+
+    :returns the score of the tiles placed from the rack, None if the placement is not legal
+    or does not use both an existing tile and a tile from the rack.
+    """
+    if row < 0 or col < 0:
+        return None
+    if (direction == HORIZONTAL and col + len(word) > len(board)) or \
+        (direction == VERTICAL and row + len(word) > len(board)):
+        return None
+
+    used = []
+    existing = 0
+    existingScore = 0
+    legal = True
+    for k in range(len(word)):
+        cell = board[row][col + k] if direction == HORIZONTAL else board[row + k][col]
+        letter = ord(word[k])
+        if cell:
+            # An existing tile is overwritten
+            if cell != word[k]:
+                legal = False
+                break
+            existing += 1
+            existingScore += scores[letter]
+        elif rack[letter]:
+            rack[letter] -= 1
+            used.append(letter)
+        # The tile is neither given nor on the board at this position
+        else:
+            legal = False
+            break
+
+    for letter in used:
+        rack[letter] += 1
+    if legal and existing and used:
+        if baseScore is None:
+            return sum(scores[letter] for letter in used)
+        return baseScore - existingScore
+    return None
+
+def firstMoves(board, currentTiles, words, scores, candidateCache=None, baseScores=None):
+    """
+    Generates the moves of the first turn, which place the words the rack can make from "1:1:H".
+
+    :param board: Board as a list of rows of letters, "" for empty cells, or a sparseboard.SparseBoard.
+
+    :param currentTiles: List of tiles to be used in the current turn.
+
+    :param words: Lexicon of the valid words.
+
+    :param scores: A map with letters as keys and scores as values.
+
+    :param candidateCache: lexicon.CandidateCache of the lexicon, defaults to None to sweep the lexicon.
+
+    :param baseScores: Array of the score of all the letters of every word, see lexicon.buildBaseScores.
+    Defaults to None to add up the scores of the letters of every word.
+
+    :returns Move objects in no particular order.
+    """
+    maxLength = min(len(board), len(currentTiles))
+    if candidateCache is not None:
+        indexes = candidateCache.candidateIndexes(currentTiles, maxLength)
+    else:
+        indexes = words.candidateIndexes(collections.Counter(currentTiles), maxLength)
+    for wordIndex in indexes:
+        word = words.words[wordIndex]
+        if baseScores is not None:
+            yield Move(word, 0, 0, HORIZONTAL, baseScores[wordIndex])
+        else:
+            yield Move(word, 0, 0, HORIZONTAL, sum(scores[letter] for letter in word))
+
+def scanMoves(board, currentTiles, firstMove, words, scores, index, candidateCache=None, baseScores=None,
+              slotIndex=None):
+    """
+    Generates every legal move for the current tiles word by word.
+    Only the words whose letter signature fits the rack plus the letters on the board are
+    placed, and each is only tried through the board positions of its own letters.
+    Generates the same moves as generateMoves.
+    With a candidate cache, the words fitting the rack plus as many letters as the fullest line
+    holds are looked up by rack, and only those are checked against the letters on the board,
+    as long as the fullest line holds no more letters than the cache allows.
+    With a slot index, only the words of the lengths of the slots left on the board are checked,
+    and each is only tried in the slots where one of its letters falls on the same tile.
+
+    :param board: Board as a list of rows of letters, "" for empty cells.
+
+    :param currentTiles: List of tiles to be used in the current turn.
+
+    :param firstMove: Boolean of whether the current turn is the first move.
+
+    :param words: Lexicon to be scanned.
+
+    :param scores: A map with letters as keys and scores as values.
+
+    :param index: BoardIndex of the board.
+
+    :param candidateCache: lexicon.CandidateCache of the lexicon, defaults to None to scan the whole lexicon.
+
+    :param baseScores: Array of the score of all the letters of every word, see lexicon.buildBaseScores.
+    Defaults to None to add up the scores of the tiles of every move.
+
+    :param slotIndex: board.SlotIndex of the board, updated before the search, defaults to None.
+
+    :returns Move objects in no particular order.
+    """
+    if firstMove:
+        yield from firstMoves(board, currentTiles, words, scores, candidateCache, baseScores)
+        return
+
+    available = collections.Counter(currentTiles)
+    for letter, positions in index.positions.items():
+        available[letter] += len(positions)
+    rack = rackTable(currentTiles)
+    scores = scoreTable(scores)
+    maxLength = min(len(board), len(currentTiles) + index.occupied)
+    lengths = None
+    if slotIndex is not None:
+        slotIndex.update(board, index, len(currentTiles))
+        maxLength = min(maxLength, slotIndex.maxLength())
+        lengths = [length for length in slotIndex.lengths if length <= maxLength]
+    if maxLength < 2:
+        return
+    profiling = instrument.ENABLED
+    candidateCount = 0
+    attempted = 0
+    found = 0
+    placementTime = 0.0
+    started = time.perf_counter()
+
+    # A move uses at most as many board letters as its line holds
+    if candidateCache is not None:
+        extra = min(maxLength - 1, max(bin(mask).count("1") for mask in index.rowMasks + index.colMasks))
+    if candidateCache is not None and extra <= candidateCache.maxExtra:
+        indexes = words.candidateIndexes(available, maxLength, 2,
+                                         indexes=candidateCache.candidateIndexes(currentTiles, maxLength, extra))
+    elif lengths is not None:
+        indexes = words.candidateIndexes(available, maxLength, 2, indexes=words.indexesOfLengths(lengths))
+    else:
+        indexes = words.candidateIndexes(available, maxLength, 2)
+
+    for wordIndex in indexes:
+        word = words.words[wordIndex]
+        if profiling:
+            placementStart = time.perf_counter()
+        candidateCount += 1
+        if slotIndex is not None:
+            placements = slotIndex.slotsOf(word)
+        else:
+            placements = set()
+            for k in range(len(word)):
+                for row, col in index.positionsOf(word[k]):
+                    placements.add((row, col - k, HORIZONTAL))
+                    placements.add((row - k, col, VERTICAL))
+        attempted += len(placements)
+        baseScore = baseScores[wordIndex] if baseScores is not None else None
+        for row, col, direction in placements:
+            score = getPlacementScore(board, word, row, col, direction, rack, scores, baseScore)
+            if score is not None:
+                found += 1
+                yield Move(word, row, col, direction, score)
+        if profiling:
+            placementTime += time.perf_counter() - placementStart
+
+    if profiling:
+        examined = words.countWithinLength(maxLength, 2)
+        instrument.addTime("prefilter", time.perf_counter() - started - placementTime)
+        instrument.addTime("placement", placementTime)
+        instrument.count("wordsExamined", examined)
+        instrument.count("wordsPruned", examined - candidateCount)
+        instrument.count("placementsAttempted", attempted)
+        instrument.count("movesFound", found)
@@ -0,0 +1,119 @@
+"""
+Description: Parallel hint computation. The lines holding tiles are split into shards searched by
+a pool of worker processes, and the best move of every shard is merged in the same order as
+movegen.bestMove so that ties are broken as in the serial search. Every worker memory maps the
+compiled lexicon once, so the DAWG is shared between the processes instead of copied to each of them.
+When the engine has published its lexicon in shared memory, or has no compiled lexicon to map, the
+workers attach to the lexicon in shared memory instead.
+"""
+
+import concurrent.futures
+import os
+
+import engine
+import instrument
+import lexicon
+import movegen
+import planner
+
+WORKER_ENGINE = None        # Engine of a worker process, see initializeWorker
+WORKER_PLANNER = None       # Planner of a worker process, None to play greedily
+
+def initializeWorker(dictionaryPath=None, sharedName=None, generator="dawg", plan=None, profile=None):
+    """
+    Loads the engine once in every worker process. Every process pool of the game starts its workers with it.
+
+    :param dictionaryPath: Path of the dictionary, mapped from its compiled lexicon, defaults to None for
+    "dictionary.txt" next to the engine.
+
+    :param sharedName: Name of the shared memory segment of the lexicon to attach to instead,
+    see engine.Engine.shareLexicon, defaults to None.
+
+    :param generator: Move generator of the hints, see engine.Engine, defaults to "dawg".
+
+    :param plan: Map of the options of the planner of the worker, see planner.Planner, defaults to None
+    to play greedily.
+
+    :param profile: Mode and output of the instrumentation, see instrument.getConfiguration, defaults to None
+    to keep the instrumentation configured from the environment. Workers started without forking do not
+    inherit the configuration of the parent process, such as the one chosen with --profile.
+    """
+    global WORKER_ENGINE, WORKER_PLANNER
+    if profile is not None:
+        instrument.configure(*profile)
+    WORKER_ENGINE = engine.Engine(dictionaryPath, generator=generator, sharedLexicon=sharedName)
+    WORKER_PLANNER = planner.Planner(WORKER_ENGINE, **plan) if plan is not None else None
+
+def bestShardMove(lines, currentTiles, firstMove, scores):
+    """
+    :param lines: Shard of the lines to search, as returned by movegen.getAnchorLines.
+
+    :param currentTiles: List of tiles to be used in the current turn.
+
+    :param firstMove: Boolean of whether the current turn is the first move.
+
+    :param scores: A map with letters as keys and scores as values.
+
+    :returns the best Move along the lines, None if there is no move.
+    """
+    return movegen.bestMove(movegen.walkLines(lines, currentTiles, firstMove, WORKER_ENGINE.getDawg(), scores))
+
+class HintPool:
+    """
+    Pool of worker processes computing the best move of a game.
+    """
+
+    def __init__(self, scrabbleEngine, processes=None, shardsPerProcess=2):
+        """
+        :param scrabbleEngine: Engine of the games the hints are computed for.
+
+        :param processes: Number of worker processes, defaults to the number of processors.
+
+        :param shardsPerProcess: Number of shards given to every process, defaults to 2
+        so that a process finishing early can take more work.
+        """
+        self.engine = scrabbleEngine
+        self.processes = processes or os.cpu_count() or 1
+        # Without a compiled lexicon to map, every worker would read the dictionary into its own memory
+        self.sharesLexicon = scrabbleEngine.sharedName is None and \
+            not isinstance(scrabbleEngine.dictionary, lexicon.PackedLexicon)
+        if self.sharesLexicon:
+            scrabbleEngine.shareLexicon()
+        self.executor = concurrent.futures.ProcessPoolExecutor(self.processes, initializer=initializeWorker,
+                                                               initargs=(scrabbleEngine.dictionaryPath,
+                                                                         scrabbleEngine.sharedName, "dawg", None,
+                                                                         instrument.getConfiguration()))
+        self.shards = self.processes * shardsPerProcess
+
+    def bestMove(self, board, currentTiles, firstMove, index=None):
+        """
+        :param board: Board as a list of rows of letters, "" for empty cells.
+
+        :param currentTiles: List of tiles to be used in the current turn.
+
+        :param firstMove: Boolean of whether the current turn is the first move.
+
+        :param index: BoardIndex of the board, defaults to None.
+
+        :returns the same Move as movegen.bestMove over movegen.generateMoves, None if there is no move.
+        """
+        lines = movegen.getAnchorLines(board, firstMove, index, len(currentTiles))
+        # Lines are dealt in turn so that the rows and columns of a crowded area are spread out
+        shards = [lines[i::self.shards] for i in range(min(self.shards, len(lines)))]
+        futures = [self.executor.submit(bestShardMove, shard, currentTiles, firstMove, self.engine.scores)
+                   for shard in shards]
+        return movegen.bestMove(move for move in (future.result() for future in futures) if move is not None)
+
+    def close(self):
+        """
+        Shuts the worker processes down, and removes the shared memory segment of the lexicon if the pool published it.
+        """
+        self.executor.shutdown()
+        if self.sharesLexicon:
+            self.engine.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exceptionInfo):
+        self.close()
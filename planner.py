@@ -0,0 +1,196 @@
+"""
+Description: Lookahead planner. The tiles are dealt in a known order, so the racks of the next
+turns can be computed and a move can be chosen for the score it leads to several moves ahead.
+The search is a beam search deepened one move at a time until the time budget runs out: only the
+best scoring moves of every position are expanded, and positions reached again are looked up in
+a transposition table keyed by a Zobrist hash of the board and the rack.
+"""
+
+import collections
+import random
+import time
+
+import engine
+import movegen
+
+ZOBRIST_SEED = 2020
+
+class PlannerTimeout(Exception):
+    """
+    Raised inside the search when the time budget of the turn has run out.
+    """
+    pass
+
+class Planner:
+    """
+    Searches the moves of a game ahead with a transposition table kept from turn to turn.
+    A planner should only be used for one game at a time, its table is emptied when the game changes.
+    """
+
+    def __init__(self, scrabbleEngine, depth=3, beamWidth=8, timeBudget=1.0, tableSize=100000):
+        """
+        :param scrabbleEngine: Engine of the games to be planned.
+
+        :param depth: Number of moves searched ahead, defaults to 3. A depth of 1 is the greedy best move.
+
+        :param beamWidth: Number of best scoring moves expanded in every position, defaults to 8.
+
+        :param timeBudget: Seconds a turn may be searched for, defaults to 1.0. The deepest search
+        completed in time is used, the first move is always searched to the end.
+
+        :param tableSize: Maximum number of positions kept in the transposition table, defaults to 100000.
+        The least recently used positions are evicted first.
+
+        :raises AssertionError if a budget is not positive.
+        """
+        assert depth > 0 and beamWidth > 0 and tableSize > 0, "Planner budgets should be positive!"
+        self.engine = scrabbleEngine
+        self.depth = depth
+        self.beamWidth = beamWidth
+        self.timeBudget = timeBudget
+        self.tableSize = tableSize
+        # A map with [hash, tiles dealt, depth] as keys and [value, move] as values
+        self.table = collections.OrderedDict()
+        self.tableGame = None                       # Tiles and board size of the game the table belongs to
+
+        # A random key for every letter in every cell, and for every copy of a letter in the rack
+        rng = random.Random(ZOBRIST_SEED)
+        self.cellKeys = [[rng.getrandbits(64) for _ in range(128)] for _ in range(engine.MAX_BOARD_SIZE ** 2)]
+        self.rackKeys = [[rng.getrandbits(64) for _ in range(engine.TILES_COUNT + 1)] for _ in range(128)]
+        self.firstMoveKey = rng.getrandbits(64)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nodes = 0
+
+    def plan(self, game):
+        """
+        Searches the best move of the game for the total score projected over the next moves.
+
+        :param game: GameState whose current tiles are to be played.
+
+        :returns the best Move, None if there is no move, the projected total score, and the depth searched.
+
+        :raises AssertionError if the board is larger than the Zobrist keys cover.
+        """
+        assert len(game.board) <= engine.MAX_BOARD_SIZE, \
+            "The planner only plans boards of up to " + str(engine.MAX_BOARD_SIZE) + " cells a side!"
+        gameKey = (tuple(game.tiles), len(game.board))
+        if self.tableGame != gameKey:
+            self.table.clear()
+            self.tableGame = gameKey
+
+        # Moves are made and undone on a copy of the game, see GameState.undoMove
+        self.deadline = time.perf_counter() + self.timeBudget
+        self.game = self.engine.newGame(len(game.board), game.tiles)
+        for letter, positions in game.boardIndex.positions.items():
+            for row, col in positions:
+                self.game.setTile(row, col, letter)
+        self.game.occupiedTiles = game.occupiedTiles
+        self.game.currentTiles = game.currentTiles.copy()
+        self.game.usedTiles = game.usedTiles
+        self.game.move = game.move
+        self.boardHash = self.getBoardHash()
+
+        value, move, searched = 0, None, 0
+        for depth in range(1, self.depth + 1):
+            try:
+                value, move = self.search(depth, depth > 1)
+            except PlannerTimeout:
+                break
+            searched = depth
+            if move is None:
+                break
+        return move, game.totalScore + value, searched
+
+    def getBoardHash(self):
+        """
+        :returns the Zobrist hash of the letters on the board being searched.
+        """
+        size = len(self.game.board)
+        value = 0
+        for letter, positions in self.game.boardIndex.positions.items():
+            for row, col in positions:
+                value ^= self.cellKeys[row * size + col][ord(letter)]
+        return value
+
+    def getHash(self):
+        """
+        :returns the Zobrist hash of the board, rack and first move flag being searched.
+        """
+        value = self.boardHash ^ (self.firstMoveKey if self.game.isFirstMove() else 0)
+        for letter, count in collections.Counter(self.game.currentTiles).items():
+            for copy in range(1, count + 1):
+                value ^= self.rackKeys[ord(letter)][copy]
+        return value
+
+    def search(self, depth, timed):
+        """
+        :param depth: Number of moves to be searched ahead.
+
+        :param timed: Whether to stop when the time budget runs out.
+
+        :returns the most score the next moves can add and the first of them, None if there is no move.
+
+        :raises PlannerTimeout if timed and the time budget has run out.
+        """
+        if timed and time.perf_counter() > self.deadline:
+            raise PlannerTimeout()
+        key = (self.getHash(), self.game.usedTiles, depth)
+        entry = self.table.get(key)
+        if entry is not None:
+            self.table.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        self.nodes += 1
+
+        moves = movegen.topMoves(self.game.iterMoves(), self.beamWidth)
+        bestValue, best = 0, None
+        for move in moves:
+            value = move.score
+            if depth > 1:
+                self.makeMove(move)
+                try:
+                    value += self.search(depth - 1, timed)[0]
+                finally:
+                    self.unmakeMove()
+            # Ties keep the earlier move, which is the better one as ordered by movegen.moveKey
+            if best is None or value > bestValue:
+                bestValue, best = value, move
+
+        self.table[key] = (bestValue, best)
+        if len(self.table) > self.tableSize:
+            self.table.popitem(last=False)
+            self.evictions += 1
+        return bestValue, best
+
+    def makeMove(self, move):
+        """
+        Places a move on the searched game and deals the next tiles.
+
+        :param move: Move to be made.
+        """
+        placement = self.game.placeTilesOnBoard([move.row + 1, move.col + 1, move.direction], move.word)
+        self.game.endTurn()
+        size = len(self.game.board)
+        for (row, col), (position, letter) in zip(placement.cells, placement.tiles):
+            self.boardHash ^= self.cellKeys[row * size + col][ord(letter)]
+
+    def unmakeMove(self):
+        """
+        Takes back the last move made with makeMove.
+        """
+        placement = self.game.undoMove()
+        size = len(self.game.board)
+        for (row, col), (position, letter) in zip(placement.cells, placement.tiles):
+            self.boardHash ^= self.cellKeys[row * size + col][ord(letter)]
+
+    def stats(self):
+        """
+        :returns a map with the positions kept and the table hits, misses and evictions so far,
+        and the number of positions expanded.
+        """
+        return {"entries": len(self.table), "size": self.tableSize, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "nodes": self.nodes}
@@ -0,0 +1,169 @@
+"""
+Description: Incremental board rendering for the terminal.
+The formatted rows of the board are kept between frames, and only the rows whose cells changed are formatted
+again. The plain mode writes every frame whole, as scrabble.printBoard prints the board. The ANSI mode keeps the
+board at the top of the terminal and only redraws the cells that changed, by moving the cursor to them.
+Every frame is written to the output at once.
+"""
+
+import sys
+
+CELL_WIDTH = 3              # Width of each cell on the board
+PLAIN = "plain"
+ANSI = "ansi"
+MODES = [PLAIN, ANSI]
+FIRST_ROW_LINE = 4          # 1-based line of the first row of an ANSI frame, below the title and column header
+
+def padCell(string, width):
+    """
+    Pads left and right of the input string with spaces so that the length makes up the width.
+
+    :param string: String to pad.
+
+    :param width: Width to pad to.
+
+    :returns padded string
+    """
+    string = str(string)
+    left = (width - len(string)) // 2
+    return " " * left + string + " " * (width - len(string) - left)
+
+class BoardRenderer:
+    """
+    Writes the frames of a board, or of a square window of it, formatting only the rows changed since the last frame.
+    """
+
+    def __init__(self, output=None, mode=PLAIN):
+        """
+        :param output: Text stream the frames are written to, defaults to None for the standard output
+        at the time of every frame.
+
+        :param mode: PLAIN to write every frame whole, or ANSI to redraw the changed cells of the last frame
+        with cursor movements, defaults to PLAIN.
+        """
+        assert mode in MODES, "Rendering mode must be one of " + ", ".join(MODES) + "!"
+        self.output = output
+        self.mode = mode
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets the last frame, the next one is formatted and written whole.
+        """
+        self.layout = None          # Rows, columns and widths of the last frame
+        self.header = ""            # Title, column header and separator of the last frame
+        self.separator = ""         # Line written below every row
+        self.cells = {}             # A map with letters as keys and padded cells as values
+        self.rows = {}              # A map with rows as keys and [cells, formatted row] as values
+        self.drawn = False          # Whether the ANSI frame is on the terminal
+
+    def getLayout(self, board, top, left, size):
+        """
+        :returns the rows and columns of the window as ranges, the width of the cells and of the row labels.
+        """
+        rows = range(top, min(len(board), top + (size or len(board))))
+        cols = range(left, min(len(board), left + (size or len(board))))
+        # Cells are widened when the column numbers do not fit
+        width = max(CELL_WIDTH, len(str(cols[-1] + 1)))
+        labelWidth = max(2, len(str(rows[-1] + 1)))
+        return rows, cols, width, labelWidth
+
+    def setLayout(self, layout):
+        """
+        Formats the header and separator of a new window, and forgets the rows formatted for the last one.
+        """
+        rows, cols, width, labelWidth = layout
+        self.layout = layout
+        self.cells = {}
+        self.rows = {}
+        self.drawn = False
+        self.separator = "-" * labelWidth + "|" + "|".join("-" * width for _ in cols) + "|\n"
+        self.header = "\nBOARD:\n" + " " * labelWidth + "|" + \
+            "|".join(padCell(index + 1, width) for index in cols) + "|\n" + self.separator
+
+    def formatCell(self, letter):
+        """
+        :returns the padded cell of a letter, "" for an empty cell.
+        """
+        cell = self.cells.get(letter)
+        if cell is None:
+            cell = self.cells[letter] = padCell(letter, self.layout[2])
+        return cell
+
+    def formatRow(self, row, cells):
+        """
+        :param row: 0-based row of the board.
+
+        :param cells: Tuple of the letters of the row in the window.
+
+        :returns the row as printed, with its label, cells and separator.
+        """
+        labelWidth = self.layout[3]
+        return str(row + 1) + " " * (labelWidth - len(str(row))) + "|" + \
+            "".join(self.formatCell(letter) + "|" for letter in cells) + "\n" + self.separator
+
+    def render(self, board, top=0, left=0, size=None):
+        """
+        Writes a frame of the board, or of a square window of it.
+
+        :param board: Board as a list of rows of letters, "" for empty cells.
+
+        :param top: 0-based first row of the window, defaults to 0.
+
+        :param left: 0-based first column of the window, defaults to 0.
+
+        :param size: Number of rows and columns of the window, defaults to None for the whole board.
+
+        :returns the number of rows formatted again for the frame.
+        """
+        layout = self.getLayout(board, top, left, size)
+        if layout != self.layout:
+            self.setLayout(layout)
+        rows, cols, width, labelWidth = layout
+
+        # Rows are compared by their letters, only the changed ones are formatted again
+        changed = []
+        for row in rows:
+            line = board[row]
+            cells = tuple(line[col] for col in cols)
+            cached = self.rows.get(row)
+            if cached is None or cached[0] != cells:
+                changed.append([row, cached[0] if cached is not None else None, cells])
+                self.rows[row] = [cells, self.formatRow(row, cells)]
+
+        if self.mode == PLAIN:
+            frame = self.header + "".join(self.rows[row][1] for row in rows)
+        elif not self.drawn:
+            # The board is drawn at the top of the cleared terminal, and the text below it scrolls on its own
+            height = FIRST_ROW_LINE - 1 + 2 * len(rows)
+            frame = "\x1b[r\x1b[H\x1b[2J" + self.header[1:] + "".join(self.rows[row][1] for row in rows) + \
+                "\x1b[" + str(height + 1) + "r\x1b[" + str(height + 1) + ";1H"
+            self.drawn = True
+        else:
+            # The cursor is moved to every changed cell and brought back to where the text below the board stopped
+            parts = []
+            for row, before, cells in changed:
+                line = FIRST_ROW_LINE + 2 * (row - rows[0])
+                # Labels 10, 100 and 1000 are one character wider than the others, as printBoard writes them
+                labelLength = len(str(row + 1)) + labelWidth - len(str(row))
+                for k, letter in enumerate(cells):
+                    if before is None or before[k] != letter:
+                        parts.append("\x1b[" + str(line) + ";" + str(labelLength + 2 + k * (width + 1)) + "H" +
+                                     self.formatCell(letter))
+            frame = "\x1b7" + "".join(parts) + "\x1b8" if parts else ""
+
+        if frame:
+            output = self.output or sys.stdout
+            output.write(frame)
+            output.flush()
+        return len(changed)
+
+    def close(self):
+        """
+        Gives the whole terminal back to the text after an ANSI frame.
+        """
+        if self.mode == ANSI and self.drawn:
+            output = self.output or sys.stdout
+            output.write("\x1b[r\x1b[999;1H\n")
+            output.flush()
+        self.drawn = False
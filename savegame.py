@@ -0,0 +1,190 @@
+"""
+Description: Saving, resuming and replaying games.
+A snapshot packs the board cells as one byte each with the tiles, the tiles dealt, the tiles in hand
+and the scores, so that games can be checkpointed and restored in microseconds.
+A move log starts with a snapshot and appends every move as a few bytes, so that it can be written
+as the game is played and replayed to rebuild any position without prompting for the moves.
+"""
+
+import struct
+
+EMPTY = "\0"                 # Letter of an empty cell in a snapshot
+SNAPSHOT_MAGIC = b"SCRSNAP\0"
+LOG_MAGIC = b"SCRMOVES"
+VERSION = 1
+# Magic, version, board size, tiles in hand, tiles dealt, tiles, total score, move score and move number,
+# followed by the cells row by row, the tiles in hand and the tiles in the order they are dealt
+SNAPSHOT = struct.Struct("<8sHBBHHiiH")
+# Magic, version and snapshot length, followed by the snapshot the moves start from
+LOG_HEADER = struct.Struct("<8sHI")
+# Row, column, direction and word length of a move, followed by the word
+MOVE = struct.Struct("<BBcB")
+MAX_BOARD_SIZE = 255         # Largest board size and coordinate a byte holds
+
+def saveSnapshot(game):
+    """
+    :param game: GameState to be saved.
+
+    :returns the snapshot of the game as bytes. The move log of the game is not saved.
+
+    :raises ValueError if the board is too large for a snapshot.
+    """
+    size = len(game.board)
+    if size > MAX_BOARD_SIZE:
+        raise ValueError("Snapshots only hold boards of up to " + str(MAX_BOARD_SIZE) + " cells a side!")
+    cells = bytearray(size ** 2)
+    for letter, positions in game.boardIndex.positions.items():
+        code = ord(letter)
+        for row, col in positions:
+            cells[row * size + col] = code
+    rack = "".join(game.currentTiles).encode("ascii")
+    tiles = "".join(game.tiles).encode("ascii")
+    return SNAPSHOT.pack(SNAPSHOT_MAGIC, VERSION, size, len(rack), game.usedTiles, len(tiles), game.totalScore,
+                         game.moveScore, game.move) + bytes(cells) + rack + tiles
+
+def loadSnapshot(scrabbleEngine, data, backend="list"):
+    """
+    :param scrabbleEngine: Engine to create the game from.
+
+    :param data: Snapshot from saveSnapshot.
+
+    :param backend: Board backend of the game, see engine.GameState, defaults to "list".
+
+    :returns a new GameState in the position of the snapshot.
+
+    :raises ValueError if the data is not a snapshot of the current version.
+    """
+    if len(data) < SNAPSHOT.size:
+        raise ValueError("The snapshot is truncated!")
+    magic, version, size, rackLength, usedTiles, tilesLength, totalScore, moveScore, move = \
+        SNAPSHOT.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version != VERSION:
+        raise ValueError("Not a snapshot of version " + str(VERSION) + "!")
+    cellsEnd = SNAPSHOT.size + size * size
+    rackEnd = cellsEnd + rackLength
+    if len(data) != rackEnd + tilesLength:
+        raise ValueError("The snapshot is truncated!")
+
+    tiles = list(bytes(data[rackEnd:]).decode("ascii"))
+    game = scrabbleEngine.newGame(size, tiles, backend)
+    # Rows are decoded whole, only the occupied cells are added to the index one by one
+    cells = bytes(data[SNAPSHOT.size:cellsEnd]).decode("ascii")
+    for row in range(size):
+        line = cells[row * size:(row + 1) * size]
+        if line.count(EMPTY) == size:
+            continue
+        # The sparse board is only written through its cells
+        if isinstance(game.board, list):
+            game.board[row] = [letter if letter != EMPTY else "" for letter in line]
+        for col in range(size):
+            if line[col] != EMPTY:
+                game.boardIndex.add(line[col], row, col)
+                if not isinstance(game.board, list):
+                    game.board[row][col] = line[col]
+    game.occupiedTiles = game.boardIndex.occupied
+    game.currentTiles = list(bytes(data[cellsEnd:rackEnd]).decode("ascii"))
+    game.usedTiles = usedTiles
+    game.totalScore = totalScore
+    game.moveScore = moveScore
+    game.move = move
+    return game
+
+class MoveLog:
+    """
+    Append-only log of the moves of a game, written to disk as they are made.
+    """
+
+    def __init__(self, path, game=None):
+        """
+        :param path: Path of the log.
+
+        :param game: GameState to start a new log from, which overwrites any file at the path.
+        Defaults to None to append to the existing log at the path, after dropping a move cut short.
+
+        :raises ValueError if an existing log is not a move log of the current version.
+        """
+        if game is not None:
+            snapshot = saveSnapshot(game)
+            self.logFile = open(path, "wb")
+            self.logFile.write(LOG_HEADER.pack(LOG_MAGIC, VERSION, len(snapshot)) + snapshot)
+            self.logFile.flush()
+        else:
+            snapshot, moves = readMoveLog(path)
+            self.logFile = open(path, "r+b")
+            self.logFile.seek(LOG_HEADER.size + len(snapshot) + sum(MOVE.size + len(move[3]) for move in moves))
+            self.logFile.truncate()
+
+    def append(self, placement):
+        """
+        Writes a move and flushes it to disk.
+
+        :param placement: engine.Placement of the move.
+        """
+        word = placement.word.encode("ascii")
+        self.logFile.write(MOVE.pack(placement.row, placement.col, placement.direction.encode("ascii"), len(word))
+                           + word)
+        self.logFile.flush()
+
+    def close(self):
+        self.logFile.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+def readMoveLog(path):
+    """
+    Reads a move log. A move cut short by a crash while it was written is left out.
+
+    :param path: Path of the log.
+
+    :returns the snapshot the moves start from and a list of [row, col, direction, word] with 0-based coordinates.
+
+    :raises ValueError if the file is not a move log of the current version.
+    """
+    with open(path, "rb") as logFile:
+        data = logFile.read()
+    if len(data) < LOG_HEADER.size:
+        raise ValueError("Not a move log!")
+    magic, version, snapshotLength = LOG_HEADER.unpack_from(data)
+    if magic != LOG_MAGIC or version != VERSION:
+        raise ValueError("Not a move log of version " + str(VERSION) + "!")
+    offset = LOG_HEADER.size + snapshotLength
+    snapshot = data[LOG_HEADER.size:offset]
+
+    moves = []
+    while offset + MOVE.size <= len(data):
+        row, col, direction, length = MOVE.unpack_from(data, offset)
+        end = offset + MOVE.size + length
+        if end > len(data):
+            break
+        moves.append([row, col, direction.decode("ascii"), data[offset + MOVE.size:end].decode("ascii")])
+        offset = end
+    return snapshot, moves
+
+def replay(scrabbleEngine, path, count=None, backend="list"):
+    """
+    Rebuilds a position by making the moves of a log, ending the turn after each of them.
+
+    :param scrabbleEngine: Engine to create the game from.
+
+    :param path: Path of the log.
+
+    :param count: Number of moves to be made, defaults to None for all of them.
+
+    :param backend: Board backend of the game, see engine.GameState, defaults to "list".
+
+    :returns the GameState after the moves.
+
+    :raises ValueError if the file is not a move log of the current version.
+
+    :raises TilesError if a move of the log is not valid in its position.
+    """
+    snapshot, moves = readMoveLog(path)
+    game = loadSnapshot(scrabbleEngine, snapshot, backend)
+    for row, col, direction, word in moves[:count]:
+        game.placeTilesOnBoard([row + 1, col + 1, direction], word)
+        game.endTurn()
+    return game
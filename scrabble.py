@@ -3,19 +3,21 @@ Author: Lin Sze Khoo
 Created on: 21/11/2020
 Last modified on: 23/11/2020
 Description: This program is a solo terminal scrabble game. Run the program and start playing.
+The game itself is played by engine.GameState, this module is its terminal front end.
 """
 
+import argparse
+import os
+
+import engine
 import exception
+import instrument
+import parallel
+import render
+import savegame
+import sparseboard
 
-BOARD = []
-DICTIONARY = []             # Stores a list of valid words
-SCORES = {}                 # A map with letters as keys and scores as values
-TILES = []                  # Tiles to be placed on the board
-CELL_WIDTH = 3              # Width of each cell on the board
-TILES_COUNT = 7             # Number of tiles to be chosen from in each turn
-USED_TILES = 0              # Number of tiles used
-BOARD_OCCUPIED_TILES = 0    # Number of tiles occupied on the board
-TOTAL_SCORE = 0             # Total score of player
+VIEWPORT_SIZE = 15          # Number of rows and columns shown of larger boards, around the last move
 
 def welcomeMessage():
     """
@@ -24,119 +26,71 @@ def welcomeMessage():
     print("GOOD DAY! WELCOME TO THE SCRABBLE GAME!")
     print("-" * 50)
     print("Here are some rules:")
-    rulesFile = open("rules.txt")
+    rulesFile = open(os.path.join(engine.DATA_DIRECTORY, "rules.txt"))
     for line in rulesFile:
         print(line.strip())
     rulesFile.close()
 
-def initializeBoard(boardSize=5):
+def printBoard(board, top=0, left=0, size=None):
     """
-    Initializes board with a default value of 5.
+    Prints the board, or a square window of it, see render.BoardRenderer.
 
-    :param boardSize: The board's size, between 5 and 15, defaults to 5
-    :type boardSize: int, optional
-    """
-    assert 5 <= boardSize <= 15, "Board size should be between 5 and 15!"
+    :param board: Board as a list of rows of letters, "" for empty cells.
 
-    for _ in range(boardSize):
-        row = []
-        for _ in range(boardSize):
-            row.append("")
-        BOARD.append(row)
+    :param top: 0-based first row of the window, defaults to 0.
 
-def createDictionary():
-    """
-    Reads from "dictionary.txt" and construct a list of valid words.
-    """
-    dictionaryFile = open("dictionary.txt")
-    for line in dictionaryFile:
-        line = line.strip()
-        DICTIONARY.append(line)
-    dictionaryFile.close()
+    :param left: 0-based first column of the window, defaults to 0.
 
-def createScoreMap():
-    """
-    Reads from "scores.txt" and construct a map with letters as keys and scores as values.
-    """
-    scoreFile = open("scores.txt")
-    for line in scoreFile:
-        line = line.strip()
-        line = line.split(" ")
-        SCORES[line[0]] = int(line[1])
-    scoreFile.close()
-
-def createTiles():
+    :param size: Number of rows and columns of the window, defaults to None for the whole board.
     """
-    Reads from "tiles.txt" and construct a list of tiles.
-    """
-    tilesFile = open("tiles.txt")
-    for line in tilesFile:
-        line = line.strip()
-        TILES.append(line)
-    tilesFile.close()
+    render.BoardRenderer().render(board, top, left, size)
 
-def padString(string, c):
+def getViewport(game, size=VIEWPORT_SIZE):
     """
-    Pads left and right of the input string with character c so that the length makes up the cell width.
-
-    :param string: String to pad
+    :param game: GameState to be shown.
 
-    :param c: Character to pad with
+    :param size: Number of rows and columns of the window, defaults to 15.
 
-    :returns padded string
-    """
-    global CELL_WIDTH
-    string = str(string)
-    remaining = CELL_WIDTH - len(string)
-    remaining = remaining // 2
-    string = c * remaining + string
-    remaining = CELL_WIDTH - len(string)
-    return string + c * remaining
-
-def printBoard():
-    """
-    Prints the board.
-    """
-    print("\nBOARD:")
-    boardColumnHeader =  "  |" + "|".join(padString(index + 1, " ") for index in range(len(BOARD))) + "|"
-    boardSeparator = "--|" + "|".join(padString("", "-") for _ in range(len(BOARD))) + "|"
-
-    print(boardColumnHeader)
-    print(boardSeparator)
-    
-    for i in range(len(BOARD)):
-        row = str(i + 1) + " " * (2 - len(str(i))) + "|"
-        for j in range(len(BOARD)):
-            row += padString(BOARD[i][j], " ") + "|"
-        print(row)
-        print(boardSeparator)
-
-def getCurrentTiles(currentTiles):
+    :returns the 0-based top row and left column of a window of the board centred on the last move,
+    or on the first cell before any move.
     """
-    Generates tiles for the current move.
-    Only a maximum of 7 tiles are returned and should consist of the unused tiles from the previous move.
+    if not game.moveLog:
+        return 0, 0
+    row, col = game.moveLog[-1].positions()[len(game.moveLog[-1].word) // 2]
+    top = min(max(0, row - size // 2), max(0, len(game.board) - size))
+    left = min(max(0, col - size // 2), max(0, len(game.board) - size))
+    return top, left
 
-    :param currentTiles: List to contain the generated tiles.
+def showBoard(game, renderer=None):
     """
-    global USED_TILES, TILES_COUNT
+    Prints the whole board, or the window around the last move of boards larger than the viewport.
 
-    # Generates a maximum of 7 tiles and uses the previous unused tiles
-    while len(currentTiles) < TILES_COUNT and USED_TILES < len(TILES):
-        currentTiles.append(TILES[USED_TILES])
-        USED_TILES += 1
+    :param game: GameState to be shown.
 
-def printTiles(currentTiles):
+    :param renderer: render.BoardRenderer writing the board, defaults to None for a new one
+    printing the same text as printBoard.
+    """
+    if renderer is None:
+        renderer = render.BoardRenderer()
+    if len(game.board) <= VIEWPORT_SIZE:
+        renderer.render(game.board)
+    else:
+        renderer.render(game.board, *getViewport(game), VIEWPORT_SIZE)
+
+def printTiles(currentTiles, scoreMap):
     """
     Prints tiles for the current turn with their scores.
 
     :param currentTiles: List of tiles to be printed.
+
+    :param scoreMap: A map with letters as keys and scores as values.
     """
     tiles = ""
     scores = ""
 
     for letter in currentTiles:
         tiles += letter + "  "
-        currentScore = SCORES[letter]
+        currentScore = scoreMap[letter]
         if currentScore > 9:
             scores += str(currentScore) + " "
         else:
@@ -145,517 +99,82 @@ def printTiles(currentTiles):
     print("\nTiles : " + tiles)
     print("Scores: " + scores + "\n")
 
-def areLettersFromBoard(letterList):
-    """
-    Determines whether the letters already exists in the board.
-
-    :param letterList: A list of letters to be checked.
-
-    :returns a list of list, each consists of an alphabet with the x and y coordinates on the board, 
-    if all letters exist in the board, false otherwise.
-    """
-    letters = []
-    # Ensures that the tiles for all the letters are found
-    foundLetters = [False for _ in range(len(letterList))]
-
-    for m in range(len(letterList)):
-        for i in range(len(BOARD)):
-            for j in range(len(BOARD)):
-                if BOARD[i][j] == letterList[m]:
-                    # More than one tile for a letter might exist
-                    if not [letterList[m], i, j] in letters:
-                        foundLetters[m] = True
-                        letters.append([letterList[m], i, j])
-    
-    if (len(letters) == 0):
-        return False
-    else:
-        try:
-            foundLetters.index(False)
-            return False
-        except ValueError:
-            return letters
-
-def canBeMadeWithTiles(word, currentTiles):
-    """
-    Determines whether the word can be constructed using the tiles given.
-
-    :param word: A word string to be checked.
-    
-    :param currentTiles: A list of tiles to be checked against.
-
-    :returns True if all of the words can be constructed with the given tiles, otherwise
-    returns a list of tiles to be checked against the board and another with the tiles to be used.
-    """
-    tilesToCompare = currentTiles.copy()
-    toCheckInBoard = []
-    tilesToUse = []
-
-    for letter in word:
-        # Looks for letters in the tiles
-        try:
-            tilesToCompare.index(letter)
-            tilesToCompare.remove(letter)
-            tilesToUse.append(letter)
-        
-        # Stores letters that are not found to be checked if they exist in the board
-        except ValueError:
-            toCheckInBoard.append(letter)
-    
-    if (len(toCheckInBoard) > 0):
-        return [toCheckInBoard, tilesToUse]
-
-    return True
-
-def wordIsValid(word, currentTiles, firstMove):
-    """
-    Determines whether the input word is valid.
-
-    :param word: Valid word with pure alphabets, exists in the dictionary list and \
-    uses letters from the current tiles or existing ones on the board.
-
-    :param currentTiles: Tiles to be used in the current turn.
-
-    :param firstMove: Boolean of whether the current turn is the first move.
-
-    :returns True if the word only contains letters from the given tiles or existing tiles from the board.
-    """
-    # Word should not contain number, white space or special characters
-    if not word.isalpha():
-        return False
-
-    # Word should be in the dictionary
-    try:
-        DICTIONARY.index(word)
-    except ValueError:
-        return False
-    
-    # Word in the first move should not contain any external tiles.
-    if firstMove:
-        if canBeMadeWithTiles(word, currentTiles):
-            return True
-        return False
-
-    # Following move must use given tiles and at least one existing tile
-    allLettersFromTiles = canBeMadeWithTiles(word, currentTiles)
-
-    # All letters are found in tiles and some from the board.
-    if (allLettersFromTiles == True):
-        existingTiles = areLettersFromBoard(word)
-
-    # Some letters are not found in tiles but are found from the board.
-    elif isinstance(allLettersFromTiles, list):
-        existingTiles = areLettersFromBoard(allLettersFromTiles[0])
-    
-    if isinstance(existingTiles, list):
-        return True
-    
-    return False
-
-def locationValidFormat(loc):
-    """
-    Determines whether the location is in valid format.
-    Returns a list of [int, int, String] of the split coordinates.
-
-    :param loc: Location string with the format of "_:_:H" or "_:_:V".
-
-    :returns a list of split location if the input is a valid location.
-
-    :raises AssertionError when the coordinates are not numeric or the direction is invalid.
-    """
-    loc = loc.split(":")
-    assert len(loc) == 3, "Location should be in the form of _:_:H or _:_:V !"
-
-    for i in range(len(loc)):
-        loc[i] = loc[i].strip()
-
-        # Checks the coordinates
-        if i == 0 or i == 1:
-            if loc[i].isnumeric():
-                loc[i] = int(loc[i])
-            else:
-                raise AssertionError("Location should be numeric!")
-        
-        # Checks the direction
-        elif i == 2:
-            if not (loc[i] == "H" or loc[i] == "V"):
-                raise AssertionError("Invalid direction!")
-    
-    return loc
-
-def locationIsValid(loc, word, currentTiles, firstMove):
-    """
-    Determines whether the input location is valid.
-    Valid location is in the correct format and within the range of the board.
-
-    :param loc: Location string to place the word in the board.
-
-    :param word: Chosen word string for the current move.
-
-    :param currentTiles: List of tiles to be used in the current turn.
-
-    :param firstMove: Boolean of whether the current turn is the first move.
-
-    :returns True if the location is valid and word is successfully placed into the board.
-
-    :raises AssertionError if the location or the word is out of the range of the board.
-    """
-    loc = locationValidFormat(loc)
-
-    # Ensures that the coordinates are within the board
-    assert (0 < loc[0] <= len(BOARD) and 0 < loc[1] <= len(BOARD)), \
-        "Please select a location within the board!"
-    
-    # Ensures that the word can fit into the board
-    assert (loc[2] == "H" and len(word) + loc[1] - 1 <= len(BOARD)) or \
-        (loc[2] == "V" and len(word) + loc[0] - 1 <= len(BOARD)), \
-        "The word could not fit into the board!"
-
-    # Attempts to place the word into the board
-    placeTilesOnBoard(loc, word, currentTiles, firstMove)
-    return True
-
-def placeTilesOnBoard(loc, word, currentTiles, firstMove):
-    """
-    Places tiles of the selected word onto the board.
-    Reverts and raises exception if the word does not use at least one existing tile.
-
-    :param loc: List of selected location.
-
-    :param word: Selected word for the current move.
-
-    :param currentTiles: List of tiles to be used in the current turn.
-
-    :param firstMove: Boolean of whether the current turn is the first move.
-
-    :raises TilesError if an existing tile is overwritten, an existing tile is not used,
-    or when neither an existing nor a given tile is used.
-    """
-    global BOARD_OCCUPIED_TILES
-    existingTiles = []  # Keeps track of existing tile to avoid counting the scores in
-
-    # If word is to be placed horizontally
-    if loc[2] == "H":
-        row = loc[0] - 1
-        startCol = loc[1] - 1
-        endCol = loc[1] + len(word) - 2
-        wordIndex = 0
-
-        for i in range(startCol, endCol + 1):
-            # Ensures that no existing tile is overwritten
-            if (BOARD[row][i] != ""):
-                if (BOARD[row][i] != word[wordIndex]):
-                    raise exception.TilesError("You must not overwrite existing tiles on the board!")
-                else:
-                    existingTiles.append(word[wordIndex])
-            else:
-                try:
-                    # Removes used tile from the list
-                    currentTiles.remove(word[wordIndex])
-                    BOARD_OCCUPIED_TILES += 1
-
-                # The tile exist in the board but is at a different location
-                except ValueError:
-                    if len(existingTiles) > 0:
-                        # Restore the board into previous state without removing existing tiles
-                        for i in range(startCol, startCol + wordIndex):
-                            if (BOARD[row][i] not in existingTiles):
-                                BOARD[row][i] = ""
-                                BOARD_OCCUPIED_TILES -= 1
-                            else:
-                                existingTiles.remove(BOARD[row][i])
-                    else:
-                        # Restore the board into previous state
-                        for i in range(startCol, startCol + wordIndex):
-                            BOARD[row][i] = ""
-                            BOARD_OCCUPIED_TILES -= 1
-                    raise exception.TilesError("You must only use the existing or given tiles!")
-
-            BOARD[row][i] = word[wordIndex]
-            wordIndex += 1
-        
-        # Revert if no existing tile is used
-        if not firstMove and len(existingTiles) == 0:
-            for i in range(startCol, endCol + 1):
-                BOARD[row][i] = "" 
-            BOARD_OCCUPIED_TILES -= len(word)
-            raise exception.TilesError("You must use at least one existing tile!")
-
-    # If word is to be placed vertically
-    elif loc[2] == "V":
-        col = loc[1] - 1
-        startRow = loc[0] - 1
-        endRow = loc[0] + len(word) - 2
-        wordIndex = 0
-
-        for i in range(startRow, endRow + 1):
-            # Ensures that no existing tile is overwritten
-            if (BOARD[i][col] != ""):
-                if (BOARD[i][col] != word[wordIndex]):
-                    raise exception.TilesError("You must not overwrite existing tiles on the board!")
-                else:
-                    existingTiles.append(word[wordIndex])
-            else:
-                try:
-                    # Removes used tile from the list
-                    currentTiles.remove(word[wordIndex])
-                    BOARD_OCCUPIED_TILES += 1
-
-                # The tile exist in the board but is at a different location
-                except ValueError:
-                    if len(existingTiles) > 0:
-                        # Restore the board into previous state without removing existing tiles
-                        for i in range(startRow, startRow + wordIndex):
-                            if (BOARD[i][col] not in existingTiles):
-                                BOARD[i][col] = ""
-                                BOARD_OCCUPIED_TILES -= 1
-                            else:
-                                existingTiles.remove(BOARD[i][col])
-                    else:
-                        # Restore the board into previous state
-                        for i in range(startRow, startRow + wordIndex):
-                            BOARD[i][col] = ""
-                            BOARD_OCCUPIED_TILES -= 1
-                    raise exception.TilesError("You must only use the existing or given tiles!")
-            
-            # Places letter into the board
-            BOARD[i][col] = word[wordIndex]
-            wordIndex += 1
-        
-        # Revert if no existing tile is used
-        if not firstMove and len(existingTiles) == 0:
-            for i in range(startRow, endRow + 1):
-                BOARD[i][col] = "" 
-            BOARD_OCCUPIED_TILES -= len(word)
-            raise exception.TilesError("You must use at least one existing tile!")
-    
-    # Prints the scores for the current turn
-    printScore(word, existingTiles)
-
-def getCurrentScore(word, existingTiles):  
-    """
-    Computes and returns the score of the current move by neglecting the existing tiles used.
-
-    :param word: Word string for the current move.
-
-    :param existingTiles: A list of existing tiles used.
-
-    :returns score for the current word.
+def printScore(game):
     """
-    score = 0
-    for letter in word:
-        # Removes letters that have been accounted for
-        if letter in existingTiles:
-            existingTiles.remove(letter)
-        else:
-            score += SCORES[letter]
-    return score
+    Prints the current and total scores.
 
-def printScore(word, existingTiles):
+    :param game: GameState after a successful move.
     """
-    Computes and prints the current and total scores.
-
-    :param word: Word string for the current move.
+    print("Your score for this move: " + str(game.moveScore))
+    print("Total score: " + str(game.totalScore))
 
-    :param existingTiles: A list of existing tiles used.
+def playGame(scrabbleEngine=None, hintPool=None, recordPath=None, resumePath=None, backend="list",
+             renderMode=render.PLAIN):
     """
-    global TOTAL_SCORE
-
-    currentScore = getCurrentScore(word, existingTiles)
-    print("Your score for this move: " + str(currentScore))
+    Plays a game in the terminal.
 
-    TOTAL_SCORE += currentScore
-    print("Total score: " + str(TOTAL_SCORE))
+    :param scrabbleEngine: Engine to create the game from, defaults to a new one loading its lexicon
+    in the background while the rules are printed and the board size is prompted for.
 
-def getLocationWithBestScore(word, existingTiles, newTiles, firstMove):
-    """
-    Looks for valid location with the highest score to fit the given word into the board.
-
-    :param word: A word string to fit into the board.
-    
-    :param existingTiles: A list of existing tiles on the board which should be used.
-
-    :param newTiles: A list of tiles which are supposed to make up the word other than those on the board.
-    
-    :param firstMove: Boolean of whether the current turn is the first move.
-
-    :returns: None if no location is found, otherwise returns a list with location string with its score.
-    """
-    # If current turn is the first move
-    if firstMove:
-        if (len(word) <= len(BOARD)):
-            return ["1:1:H", getCurrentScore(word, [])]
-        else:
-            return None
-    else:
-        bestScore = 0
-        bestLocation = ""
-        usedTiles = []
-
-        # Attempt to place word into the board using existing tiles
-        for letterLoc in existingTiles:
-            for i in range(len(word)):
-                if (word[i] == letterLoc[0]):
-                    if (letterLoc[1] - i < 0 and letterLoc[2] - i < 0):
-                        continue
-                    
-                    # Attempt to place word horizontally
-                    elif letterLoc[1] - i >= 0 and letterLoc[1] - i + len(word) - 1 < len(BOARD):
-                        wordIndex = 0
-                        for j in range(letterLoc[1] - i, letterLoc[1] - i + len(word)):
-                            # If an existing tile is overwritten
-                            if (BOARD[j][letterLoc[2]] != "" and BOARD[j][letterLoc[2]] != word[wordIndex]):
-                                break
-
-                            # If an existing tile is used
-                            elif BOARD[j][letterLoc[2]] != "":
-                                usedTiles.append(word[wordIndex])
-                                wordIndex += 1
-                            
-                            # If a tile given is used
-                            elif word[wordIndex] in newTiles:
-                                newTiles.remove(word[wordIndex])
-                                wordIndex += 1
-                            
-                            # The tile is from the board but at another position
-                            else:
-                                break
-                        
-                        # Successful attempt
-                        if wordIndex == len(word):
-                            currentScore = getCurrentScore(word, usedTiles)
-                            if (currentScore > bestScore):
-                                bestScore = currentScore
-                                bestLocation = str(letterLoc[1] - i + 1) + ":" + str(letterLoc[2] + 1) + ":V"
-                    
-                    # Attempt to place word vertically
-                    elif letterLoc[2] - i >= 0 and letterLoc[2] - i + len(word) - 1 < len(BOARD):
-                        wordIndex = 0
-                        for j in range(letterLoc[2] - i, letterLoc[2] - i + len(word)):
-                            # If an existing tile is overwritten
-                            if (BOARD[letterLoc[1]][j] != "" and BOARD[letterLoc[1]][j] != word[wordIndex]):
-                                break
-
-                            # If an existing tile is used
-                            elif BOARD[letterLoc[1]][j] != "":
-                                usedTiles.append(word[wordIndex])
-                                wordIndex += 1
-
-                            # If a tile given is used
-                            elif word[wordIndex] in newTiles:
-                                wordIndex += 1
-                            
-                            # The tile is from the board but at another position
-                            else:
-                                break
-                        
-                        # Successful attempt
-                        if wordIndex == len(word):
-                            currentScore = getCurrentScore(word, usedTiles)
-                            if (currentScore > bestScore):
-                                bestScore = currentScore
-                                bestLocation = str(letterLoc[1] + 1) + ":" + str(letterLoc[2] - i + 1) + ":H"
-        
-        # No valid location is found
-        if bestScore == 0:
-            return None
-        return [bestLocation, bestScore]
+    :param hintPool: parallel.HintPool computing the best moves, defaults to None to compute them in this process.
 
-def getCurrentBest(currentTiles, firstMove):
-    """
-    Generates move with the maximum score.
+    :param recordPath: Path of a move log to write the game to, defaults to None, see savegame.MoveLog.
 
-    :param currentTiles: List of tiles to be used in the current turn.
+    :param resumePath: Path of a move log to resume the game of and append the next moves to, defaults to None.
 
-    :param firstMove: Boolean of whether the current turn is the first move.
+    :param backend: Board backend of the game, see engine.GameState, defaults to "list".
+    The "sparse" backend allows boards of up to 1000 cells a side, shown through a window around the last move.
 
-    :returns a list consisting of word with maximum score, the score, and its location in the board.
+    :param renderMode: Mode of the board renderer, see render.BoardRenderer, defaults to render.PLAIN
+    to print the whole board after every move.
     """
-    bestWord = None
-    bestScore = 0
-    bestLocation = None
-
-    for validWord in DICTIONARY:
-        # If the current turn is the first move
-        if firstMove:
-            # If not all the letters are found from the tiles
-            if isinstance(canBeMadeWithTiles(validWord, currentTiles), list):
-                continue
-            existingTiles = []
-            newTiles = []
-        
-        else:
-            checkedTiles = canBeMadeWithTiles(validWord, currentTiles)
-
-            # If all letters are found from the tiles, checks if any letters exist in the board
-            if (checkedTiles == True):
-                existingTiles = areLettersFromBoard(validWord)
-
-            # If some letters are found from the tiles, checks if those exist in the board
-            elif isinstance(checkedTiles, list):
-                existingTiles = areLettersFromBoard(checkedTiles[0])
-
-            # If no existing tile is used
-            if not isinstance(existingTiles, list):
-                continue
-            
-            # If all letters are found from the tiles and some from the board
-            elif (checkedTiles == True):
-                newTiles = currentTiles.copy()
-            
-            # If some letters are found from the tiles and the rest are found from the board
-            else:
-                newTiles = checkedTiles[1]
-        
-        # Attempts to get a valid location with the highest score to place the word
-        locationWithScore = getLocationWithBestScore(validWord, existingTiles, newTiles, firstMove)
-        if locationWithScore is not None:
-            if locationWithScore[1] > bestScore:
-                bestWord = validWord
-                bestScore = locationWithScore[1]
-                bestLocation = locationWithScore[0]
-
-    return [bestWord, bestScore, bestLocation]
-
-def playGame():
-    createDictionary()
-    createScoreMap()
-    createTiles()
+    if scrabbleEngine is None:
+        scrabbleEngine = engine.Engine(background=True)
     welcomeMessage()
 
-    # Prompts for board size
+    # Prompts for board size unless a game is resumed
     validBoard = False
+    moveLog = None
+    if resumePath is not None:
+        game = savegame.replay(scrabbleEngine, resumePath, backend=backend)
+        moveLog = savegame.MoveLog(resumePath)
+        validBoard = True
     # Prompts until a valid board size is entered
+    maxSize = sparseboard.MAX_BOARD_SIZE if backend == "sparse" else engine.MAX_BOARD_SIZE
+    # Move logs start with a snapshot, which holds smaller boards than the sparse backend
+    if recordPath is not None:
+        maxSize = min(maxSize, savegame.MAX_BOARD_SIZE)
     while not validBoard:
-        inputBoardSize = input("\nEnter your board size (5 - 15): ")
+        inputBoardSize = input("\nEnter your board size (5 - " + str(maxSize) + "): ")
         try:
             if (inputBoardSize.isnumeric()):
-                initializeBoard(int(inputBoardSize))
+                assert recordPath is None or int(inputBoardSize) <= savegame.MAX_BOARD_SIZE, \
+                    "Recorded games have boards of up to " + str(savegame.MAX_BOARD_SIZE) + " cells a side!"
+                game = scrabbleEngine.newGame(int(inputBoardSize), backend=backend)
             else:
                 # Uses default value
-                initializeBoard()
+                game = scrabbleEngine.newGame(backend=backend)
             validBoard = True
 
         # When board size is beyond the range
         except AssertionError as message:
             print(message)
 
-    printBoard()
+    renderer = render.BoardRenderer(mode=renderMode)
+    showBoard(game, renderer)
 
     userInput = ""
     quit = False
-    move = 1
-    currentTiles = []
-    getCurrentTiles(currentTiles)     # Generates tiles for the current move
+    game.getCurrentTiles()     # Generates tiles for the current move
+    if recordPath is not None and moveLog is None:
+        moveLog = savegame.MoveLog(recordPath, game)
 
     # Game ends when player quits or wins the game
-    while not quit and BOARD_OCCUPIED_TILES < int(inputBoardSize) ** 2:
-        printTiles(currentTiles)    
-        [bestWord, bestScore, bestLocation] = getCurrentBest(currentTiles, move == 1)
-        currentTilesCopy = currentTiles.copy()
+    while not quit and not game.isFull():
+        printTiles(game.currentTiles, scrabbleEngine.scores)
 
-        # No possible move is found
-        if (bestWord is None):
+        # No possible move is found, the search stops at the first legal move
+        if not game.hasLegalMove():
             print("No possible move found!")
             break
 
@@ -668,10 +187,14 @@ def playGame():
                 quit = True
                 break
 
-            validWord = wordIsValid(userInput, currentTiles, move == 1)
+            validWord = game.wordIsValid(userInput)
             currentWord = userInput
             if (not validWord):
                 print("Invalid word! You must use letters from the tiles!")
+
+        # The best move is shown after the move, it is searched for before the board changes
+        if validWord:
+            [bestWord, bestScore, bestLocation] = game.getCurrentBest(hintPool)
         
         # Prompts for location
         validLocation = False
@@ -683,30 +206,56 @@ def playGame():
                 break
 
             try:
-                validLocation = locationIsValid(userInput, currentWord, currentTiles, move == 1)
+                validLocation = game.locationIsValid(userInput, currentWord)
             # Assertion error is raised if requires new location input
             except AssertionError as message:
                 print(message)
             # TilesError is raised if requires new word and location input
             except exception.TilesError as message:
                 print(message)
-                # Restores the tiles that might have been removed
-                currentTiles = currentTilesCopy
                 break
         
         # Prints the board if a move is successfully completed
         if (validWord and validLocation):
+            if moveLog is not None:
+                moveLog.append(game.moveLog[-1])
+            printScore(game)
             print("Maximum possible score in this move is " + str(bestScore) + " using the word " + bestWord + 
             " at " + bestLocation)
-            printBoard()
-            move += 1
-            getCurrentTiles(currentTiles)
+            showBoard(game, renderer)
+            game.endTurn()
         
         # If all the tiles are occupied
-        if BOARD_OCCUPIED_TILES == int(inputBoardSize) ** 2:
+        if game.isFull():
             print("You won the game!")
             break
 
+    if moveLog is not None:
+        moveLog.close()
+    renderer.close()
     print("Hope you had fun, do come back again!")
 
-playGame()
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description="Plays scrabble in the terminal.")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="number of worker processes computing the best move, 0 to compute it in this process")
+    parser.add_argument("--record", help="file to write the moves of the game to")
+    parser.add_argument("--resume", help="file of recorded moves to resume the game of, the next moves are added to it")
+    parser.add_argument("--backend", choices=engine.BACKENDS, default="list",
+                        help="board backend, \"sparse\" for boards of up to 1000 cells a side")
+    parser.add_argument("--render", choices=render.MODES, default=render.PLAIN,
+                        help="\"ansi\" to keep the board at the top of the terminal and only redraw the changed cells")
+    instrument.addArguments(parser)
+    arguments = parser.parse_args()
+    instrument.configureFromArguments(arguments)
+
+    if arguments.processes > 0:
+        scrabbleEngine = engine.Engine()
+        with parallel.HintPool(scrabbleEngine, arguments.processes) as hintPool:
+            playGame(scrabbleEngine, hintPool, arguments.record, arguments.resume, arguments.backend, arguments.render)
+    else:
+        playGame(recordPath=arguments.record, resumePath=arguments.resume, backend=arguments.backend,
+                 renderMode=arguments.render)
+
+if __name__ == "__main__":
+    main()
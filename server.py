@@ -0,0 +1,321 @@
+"""
+Description: Game server hosting many concurrent sessions over TCP or a Unix socket.
+Every connection is a session playing one game at a time with a line protocol: each request is a
+JSON object on one line, answered by one JSON line with "ok" and either the result or an "error".
+Hints are computed off the event loop, in worker processes from a snapshot of the game, so a slow
+hint never holds up the other sessions. Hints are given up after the deadline of their session,
+and refused with a "busy" error once too many are being computed.
+Run "python server.py --help" for the options, and see Client for a local client.
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+
+import engine
+import exception
+import instrument
+import parallel
+import savegame
+
+DEFAULT_PORT = 8765
+LINE_LIMIT = 4096           # Longest request line accepted, in bytes
+HINT_DEADLINE = 5.0         # Seconds a hint may take before it is given up
+
+def computeHint(snapshot, count=None):
+    """
+    :param snapshot: Snapshot of the game, see savegame.saveSnapshot.
+
+    :param count: Number of best moves to list, defaults to None for the best move only.
+
+    :returns the result of getCurrentBest for the game, or of getTopMoves if a count is given.
+    """
+    game = savegame.loadSnapshot(parallel.WORKER_ENGINE, snapshot)
+    return game.getCurrentBest() if count is None else game.getTopMoves(count)
+
+class Session:
+    """
+    Game of a connection and the options it chose.
+    """
+
+    def __init__(self, hintDeadline):
+        """
+        :param hintDeadline: Seconds a hint may take before it is given up.
+        """
+        self.game = None
+        self.hintDeadline = hintDeadline
+        self.hintFuture = None      # Hint computed on the game itself in a thread, see GameServer.computeHint
+
+class GameServer:
+    """
+    Serves sessions of a shared engine, computing their hints in a pool of worker processes.
+    """
+
+    def __init__(self, scrabbleEngine=None, workers=None, maxPendingHints=None, maxSessions=1000,
+                 hintDeadline=HINT_DEADLINE, sharedLexicon=False):
+        """
+        :param scrabbleEngine: Engine of the games, defaults to a new one.
+
+        :param workers: Number of worker processes computing hints, defaults to the number of processors.
+        0 computes them in a thread of this process instead.
+
+        :param maxPendingHints: Most hints computed or queued at once before new ones are refused,
+        defaults to 4 per worker.
+
+        :param maxSessions: Most sessions connected at once, further connections are refused, defaults to 1000.
+
+        :param hintDeadline: Default number of seconds a hint may take before it is given up, defaults to 5.
+
+        :param sharedLexicon: Whether the worker processes attach to the lexicon published in shared memory
+        by the engine instead of mapping the compiled lexicon each, defaults to False.
+        """
+        self.engine = scrabbleEngine or engine.Engine()
+        if workers == 0:
+            self.executor = concurrent.futures.ThreadPoolExecutor(1)
+        else:
+            workers = workers or os.cpu_count() or 1
+            sharedName = self.engine.shareLexicon() if sharedLexicon else None
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=parallel.initializeWorker,
+                initargs=(self.engine.dictionaryPath, sharedName, self.engine.generator, None,
+                          instrument.getConfiguration()))
+        self.maxPendingHints = maxPendingHints or 4 * max(workers, 1)
+        self.pendingHints = 0       # Hints computed or queued, including those given up but still running
+        self.maxSessions = maxSessions
+        self.sessions = 0
+        self.hintDeadline = hintDeadline
+        self.commands = {"new": self.newGame, "state": self.getState, "play": self.play, "hint": self.hint,
+                         "top": self.topMoves}
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """
+        Starts listening, on a Unix socket if a path is given and on TCP otherwise.
+
+        :returns the asyncio server.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handleConnection, path, limit=LINE_LIMIT)
+        return await asyncio.start_server(self.handleConnection, host, port, limit=LINE_LIMIT)
+
+    def close(self):
+        """
+        Stops the worker processes and removes the shared memory segment of the lexicon, if any.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.engine.close()
+
+    async def handleConnection(self, reader, writer):
+        """
+        Serves the requests of a connection one at a time until it is closed.
+        The next request is only read once the answer to the previous one has been sent.
+        """
+        if self.sessions >= self.maxSessions:
+            writer.write(self.encode({"ok": False, "error": "Too many sessions!"}))
+            await writer.drain()
+            writer.close()
+            return
+
+        self.sessions += 1
+        session = Session(self.hintDeadline)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(self.encode({"ok": False, "error": "Request is too long!"}))
+                    break
+                if not line:
+                    break
+                response = await self.handleRequest(session, line)
+                writer.write(self.encode(response))
+
+                # Waits for a slow client to read the answers before taking more requests
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    def encode(self, response):
+        return (json.dumps(response) + "\n").encode()
+
+    async def handleRequest(self, session, line):
+        """
+        :param session: Session of the connection.
+
+        :param line: Request line.
+
+        :returns the response map.
+        """
+        try:
+            request = json.loads(line)
+            command = self.commands[request["cmd"]]
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "error": "Requests should be JSON objects with a known \"cmd\"!"}
+        if command != self.newGame and session.game is None:
+            return {"ok": False, "error": "Start a game with the \"new\" command first!"}
+
+        # A hint given up in a thread may still be reading the game, it has to end before the game changes
+        if session.hintFuture is not None and not session.hintFuture.done():
+            await asyncio.wait([asyncio.wrap_future(session.hintFuture)])
+
+        try:
+            response = await command(session, request)
+        except KeyError as field:
+            return {"ok": False, "error": "The request should have a " + str(field) + " field!"}
+        # Numbers beyond the range of a float are read as infinite, which cannot be made integers
+        except (AssertionError, exception.TilesError, ValueError, TypeError, OverflowError) as message:
+            return {"ok": False, "error": str(message)}
+        response["ok"] = True
+        return response
+
+    async def newGame(self, session, request):
+        """
+        Starts a game of {"size": 5 to 15, "deadline": seconds a hint may take}, both optional.
+        """
+        session.game = self.engine.newGame(int(request.get("size", 5)))
+        session.game.getCurrentTiles()
+        session.hintDeadline = float(request.get("deadline", self.hintDeadline))
+        return self.describe(session.game)
+
+    async def getState(self, session, request):
+        return self.describe(session.game)
+
+    def describe(self, game):
+        """
+        :returns a map with the board rows, with "." for empty cells, the tiles in hand, the scores and the move number.
+        """
+        return {"board": ["".join(letter or "." for letter in row) for row in game.board],
+                "tiles": game.currentTiles, "move": game.move, "moveScore": game.moveScore,
+                "totalScore": game.totalScore, "full": game.isFull()}
+
+    async def play(self, session, request):
+        """
+        Plays {"word": word, "location": "_:_:H" or "_:_:V"} and deals the tiles of the next move.
+        """
+        game = session.game
+        word = str(request["word"]).upper()
+        if not game.wordIsValid(word):
+            raise ValueError("Invalid word! You must use letters from the tiles!")
+        game.locationIsValid(str(request["location"]).upper(), word)
+        game.endTurn()
+        return self.describe(game)
+
+    async def hint(self, session, request):
+        """
+        Computes the best move, with "word" null if there is none.
+        {"deadline": seconds} overrides the deadline of the session for this hint.
+        """
+        [word, score, location] = await self.computeHint(session, request)
+        return {"word": word, "score": score, "location": location}
+
+    async def topMoves(self, session, request):
+        """
+        Lists the {"count": number} best moves, 5 by default, as [word, score, location].
+        {"deadline": seconds} overrides the deadline of the session for this hint.
+        """
+        return {"moves": await self.computeHint(session, request, int(request.get("count", 5)))}
+
+    async def computeHint(self, session, request, count=None):
+        """
+        Computes a hint off the event loop, see computeHint.
+        The hint is given up after the deadline, and refused if too many are pending.
+
+        :raises ValueError if the hint is refused or given up.
+        """
+        deadline = float(request.get("deadline", session.hintDeadline))
+        if self.pendingHints >= self.maxPendingHints:
+            raise ValueError("The server is busy, try again later!")
+        self.pendingHints += 1
+        if isinstance(self.executor, concurrent.futures.ProcessPoolExecutor):
+            future = self.executor.submit(computeHint, savegame.saveSnapshot(session.game), count)
+        else:
+            if count is None:
+                future = self.executor.submit(session.game.getCurrentBest)
+            else:
+                future = self.executor.submit(session.game.getTopMoves, count)
+            session.hintFuture = future
+
+        # The slot is only freed once the computation ends, even if it was given up
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda future: loop.call_soon_threadsafe(self.releaseHint))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), deadline)
+        except asyncio.TimeoutError:
+            raise ValueError("The hint took longer than " + str(deadline) + " seconds!")
+
+    def releaseHint(self):
+        """
+        Frees the slot of a hint once its computation has ended, called on the event loop.
+        """
+        self.pendingHints -= 1
+
+class Client:
+    """
+    Local client sending requests to a GameServer and waiting for their answers.
+    """
+
+    async def connect(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """
+        Connects to a server, on a Unix socket if a path is given and on TCP otherwise.
+        """
+        if path is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(host, port)
+        return self
+
+    async def send(self, command, **fields):
+        """
+        :param command: Name of the command.
+
+        :param fields: Fields of the request.
+
+        :returns the response map.
+        """
+        fields["cmd"] = command
+        self.writer.write((json.dumps(fields) + "\n").encode())
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def serve(arguments):
+    """
+    Runs the server until it is interrupted.
+    """
+    gameServer = GameServer(workers=arguments.workers, maxPendingHints=arguments.max_pending,
+                            maxSessions=arguments.max_sessions, hintDeadline=arguments.deadline,
+                            sharedLexicon=arguments.shared_lexicon)
+    server = await gameServer.start(arguments.host, arguments.port, arguments.unix)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        gameServer.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Hosts scrabble games over a JSON line protocol.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument("--unix", default=None, help="path of a Unix socket to listen on instead of TCP")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes computing hints, 0 to compute them in a thread")
+    parser.add_argument("--max-pending", type=int, default=None, help="most hints computed at once")
+    parser.add_argument("--max-sessions", type=int, default=1000, help="most sessions connected at once")
+    parser.add_argument("--deadline", type=float, default=HINT_DEADLINE, help="seconds a hint may take")
+    parser.add_argument("--shared-lexicon", action="store_true",
+                        help="publish the lexicon in shared memory for the worker processes to attach to")
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(serve(arguments))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
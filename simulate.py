@@ -0,0 +1,193 @@
+"""
+Description: Headless self-play. Plays complete games by always applying the best move from
+getCurrentBest, and reports the throughput and the score distribution of the games.
+Run "python simulate.py --help" for the options.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import random
+import statistics
+import time
+
+import engine
+import instrument
+import parallel
+import planner
+
+def dealTiles(tiles, seed=None):
+    """
+    :param tiles: List of tiles in the order of "tiles.txt".
+
+    :param seed: Seed to shuffle the tiles with, defaults to None to keep their order.
+
+    :returns the list of tiles to deal in a game.
+    """
+    tiles = tiles.copy()
+    if seed is not None:
+        random.Random(seed).shuffle(tiles)
+    return tiles
+
+def playSelfGame(scrabbleEngine, boardSize, seed=None, gamePlanner=None):
+    """
+    Plays a game until the board is full or no move is possible, always making the best move.
+
+    :param scrabbleEngine: Engine to create the game from.
+
+    :param boardSize: The board's size, between 5 and 15.
+
+    :param seed: Seed to shuffle the tiles with, defaults to None to deal them in order.
+
+    :param gamePlanner: planner.Planner choosing the moves, defaults to None for the best move of every turn.
+
+    :returns a map with the seed, final score, number of moves, whether the board was filled,
+    and the time taken in seconds.
+    """
+    start = time.perf_counter()
+    game = scrabbleEngine.newGame(boardSize, dealTiles(scrabbleEngine.tiles, seed))
+    game.getCurrentTiles()
+
+    while not game.isFull():
+        if gamePlanner is not None:
+            best = game.getPlannedBest(gamePlanner)
+        else:
+            best = game.getCurrentBest()
+        bestWord, bestLocation = best[0], best[2]
+        if bestWord is None:
+            break
+        game.locationIsValid(bestLocation, bestWord)
+        game.endTurn()
+
+    return {"seed": seed, "score": game.totalScore, "moves": game.move - 1, "full": game.isFull(),
+            "seconds": time.perf_counter() - start}
+
+def playWorkerGame(arguments):
+    """
+    :param arguments: List of the board size and seed of the game.
+
+    :returns the result of playSelfGame with the engine and planner of the worker, see parallel.initializeWorker.
+    """
+    return playSelfGame(parallel.WORKER_ENGINE, *arguments, parallel.WORKER_PLANNER)
+
+def summarize(results, seconds):
+    """
+    :param results: List of results of playSelfGame.
+
+    :param seconds: Wall-clock time taken to play all the games.
+
+    :returns a map with the throughput and the distribution of the scores.
+    """
+    scores = [result["score"] for result in results]
+    moves = sum(result["moves"] for result in results)
+    summary = {"games": len(results), "moves": moves, "seconds": seconds,
+               "gamesPerSecond": len(results) / seconds if seconds else 0.0,
+               "movesPerSecond": moves / seconds if seconds else 0.0,
+               "filledBoards": sum(1 for result in results if result["full"])}
+    if len(scores) == 1:
+        summary["scores"] = {"min": scores[0], "max": scores[0], "mean": scores[0], "median": scores[0],
+                             "stdev": 0.0, "quartiles": [scores[0]] * 3}
+    elif scores:
+        summary["scores"] = {"min": min(scores), "max": max(scores), "mean": statistics.mean(scores),
+                             "median": statistics.median(scores), "stdev": statistics.stdev(scores),
+                             "quartiles": statistics.quantiles(scores, n=4, method="inclusive")}
+    return summary
+
+def simulate(games, boardSize, seed=None, processes=1, scrabbleEngine=None, generator="dawg", plan=None,
+             sharedLexicon=False):
+    """
+    Plays the games, in a process pool if more than one process is requested.
+
+    :param games: Number of games to play.
+
+    :param boardSize: The board's size, between 5 and 15.
+
+    :param seed: Seed of the first game, the following ones use the next seeds.
+    Defaults to None to deal the tiles in order in every game.
+
+    :param processes: Number of worker processes, defaults to 1 to play in this process.
+
+    :param scrabbleEngine: Engine to play with in this process, defaults to a new one.
+
+    :param generator: Move generator of the hints of the new engines, see engine.Engine, defaults to "dawg".
+
+    :param plan: Map of the options of the planner choosing the moves, see planner.Planner,
+    defaults to None for the best move of every turn.
+
+    :param sharedLexicon: Whether the worker processes attach to the lexicon published in shared memory
+    by this process instead of mapping the compiled lexicon each, defaults to False.
+
+    :returns a list of the results of every game, in the order of their seeds, and the summary of the games.
+    """
+    assert 5 <= boardSize <= 15, "Board size should be between 5 and 15!"
+    seeds = [None if seed is None else seed + i for i in range(games)]
+
+    start = time.perf_counter()
+    if processes > 1:
+        dictionaryPath = scrabbleEngine.dictionaryPath if scrabbleEngine is not None else None
+        sharedName = None
+        if sharedLexicon:
+            scrabbleEngine = scrabbleEngine or engine.Engine(generator=generator)
+            sharedName = scrabbleEngine.shareLexicon()
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                    processes, initializer=parallel.initializeWorker,
+                    initargs=[dictionaryPath, sharedName, generator, plan, instrument.getConfiguration()]) as executor:
+                chunksize = max(1, games // (processes * 4))
+                results = list(executor.map(playWorkerGame, [[boardSize, gameSeed] for gameSeed in seeds],
+                                            chunksize=chunksize))
+        finally:
+            if sharedLexicon:
+                scrabbleEngine.close()
+    else:
+        if scrabbleEngine is None:
+            scrabbleEngine = engine.Engine(generator=generator)
+        gamePlanner = planner.Planner(scrabbleEngine, **plan) if plan is not None else None
+        results = [playSelfGame(scrabbleEngine, boardSize, gameSeed, gamePlanner) for gameSeed in seeds]
+
+    return results, summarize(results, time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays scrabble games against the best move without a terminal.")
+    parser.add_argument("--games", type=int, default=10, help="number of games to play")
+    parser.add_argument("--size", type=int, default=15, help="board size between 5 and 15")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="shuffle the tiles of game i with seed + i, the tiles are dealt in order otherwise")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--generator", choices=engine.GENERATORS, default="dawg", help="move generator of the hints")
+    parser.add_argument("--plan-depth", type=int, default=0,
+                        help="number of moves the planner searches ahead, 0 to always make the best move")
+    parser.add_argument("--plan-beam", type=int, default=8, help="number of best moves the planner expands")
+    parser.add_argument("--plan-time", type=float, default=1.0, help="seconds the planner may search every turn")
+    parser.add_argument("--plan-table", type=int, default=100000,
+                        help="number of positions kept in the transposition table of the planner")
+    parser.add_argument("--shared-lexicon", action="store_true",
+                        help="publish the lexicon in shared memory for the worker processes to attach to")
+    parser.add_argument("--json", action="store_true", help="print the summary and every game as JSON")
+    instrument.addArguments(parser)
+    arguments = parser.parse_args()
+    instrument.configureFromArguments(arguments)
+
+    plan = None
+    if arguments.plan_depth > 0:
+        plan = {"depth": arguments.plan_depth, "beamWidth": arguments.plan_beam, "timeBudget": arguments.plan_time,
+                "tableSize": arguments.plan_table}
+    results, summary = simulate(arguments.games, arguments.size, arguments.seed, arguments.processes,
+                                generator=arguments.generator, plan=plan, sharedLexicon=arguments.shared_lexicon)
+    if arguments.json:
+        print(json.dumps({"summary": summary, "games": results}, indent=2))
+        return
+
+    print("Games: " + str(summary["games"]) + " in " + format(summary["seconds"], ".2f") + "s")
+    print("Games/sec: " + format(summary["gamesPerSecond"], ".2f"))
+    print("Moves/sec: " + format(summary["movesPerSecond"], ".2f"))
+    print("Filled boards: " + str(summary["filledBoards"]))
+    if "scores" in summary:
+        scores = summary["scores"]
+        print("Scores: min " + str(scores["min"]) + ", quartiles " +
+              ", ".join(format(quartile, ".1f") for quartile in scores["quartiles"]) +
+              ", max " + str(scores["max"]) + ", mean " + format(scores["mean"], ".1f") +
+              ", stdev " + format(scores["stdev"], ".1f"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Description: Sparse board backend for boards of up to 1000 by 1000 cells.
+Only the occupied cells are stored, in a map keyed by their coordinates, along with the sorted occupied
+columns of every row and rows of every column, so that lines are read in proportion to their tiles.
+The board reads like the list board of GameState: board[row][col] is the letter of a cell, "" if it is empty.
+"""
+
+import bisect
+
+MIN_BOARD_SIZE = 5
+MAX_BOARD_SIZE = 1000
+HORIZONTAL = "H"
+VERTICAL = "V"
+
+class SparseRow:
+    """
+    View of one row of a SparseBoard, indexed by column like a row of the list board.
+    """
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.size
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.board.size:
+            raise IndexError("Column out of range!")
+        return self.board.cells.get((self.row, col), "")
+
+    def __setitem__(self, col, letter):
+        if not 0 <= col < self.board.size:
+            raise IndexError("Column out of range!")
+        self.board.setTile(self.row, col, letter)
+
+    def __iter__(self):
+        """
+        Generates every cell of the row, empty ones included, for code reading the board as a whole.
+        """
+        for col in range(self.board.size):
+            yield self.board.cells.get((self.row, col), "")
+
+class SparseBoard:
+    """
+    Square board storing only its occupied cells.
+    """
+
+    def __init__(self, boardSize):
+        """
+        :param boardSize: The board's size.
+        """
+        self.size = boardSize
+        self.cells = {}     # A map with [row, col] as keys and letters as values
+        self.rows = {}      # A map with rows as keys and sorted lists of their occupied columns as values
+        self.cols = {}      # A map with columns as keys and sorted lists of their occupied rows as values
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.size:
+            raise IndexError("Row out of range!")
+        return SparseRow(self, row)
+
+    def __iter__(self):
+        for row in range(self.size):
+            yield SparseRow(self, row)
+
+    def setTile(self, row, col, letter):
+        """
+        Writes a single letter, "" to empty the cell.
+        """
+        occupied = (row, col) in self.cells
+        if letter:
+            self.cells[row, col] = letter
+            if not occupied:
+                bisect.insort(self.rows.setdefault(row, []), col)
+                bisect.insort(self.cols.setdefault(col, []), row)
+        elif occupied:
+            del self.cells[row, col]
+            for lines, line, position in [[self.rows, row, col], [self.cols, col, row]]:
+                positions = lines[line]
+                del positions[bisect.bisect_left(positions, position)]
+                if not positions:
+                    del lines[line]
+
+    def segments(self, direction, lineIndex, reach):
+        """
+        Cuts a line into the windows that moves along it can cover. A move fills at most reach empty cells,
+        so it starts at most reach cells before a tile, ends at most reach cells after one, and cannot
+        bridge a gap of more than reach empty cells between two tiles.
+
+        :param direction: HORIZONTAL or VERTICAL.
+
+        :param lineIndex: 0-based index of the row or column.
+
+        :param reach: Number of tiles in the rack.
+
+        :returns a list of [start, line] with the 0-based position of the first cell of every window
+        and its letter codes, 0 for empty cells.
+        """
+        if direction == HORIZONTAL:
+            positions = self.rows.get(lineIndex, [])
+            letterAt = lambda position: self.cells[lineIndex, position]
+        else:
+            positions = self.cols.get(lineIndex, [])
+            letterAt = lambda position: self.cells[position, lineIndex]
+
+        segments = []
+        first = 0
+        for k in range(1, len(positions) + 1):
+            if k < len(positions) and positions[k] - positions[k - 1] - 1 <= reach:
+                continue
+            start = max(0, positions[first] - reach)
+            end = min(self.size, positions[k - 1] + reach + 1)
+            line = [0] * (end - start)
+            for position in positions[first:k]:
+                line[position - start] = ord(letterAt(position))
+            segments.append([start, line])
+            first = k
+        return segments
+
+    def anchorLines(self, reach):
+        """
+        :param reach: Number of tiles in the rack.
+
+        :returns a list of the windows of the lines holding tiles as [direction, line index, letter codes, start],
+        see segments. Rows come first, each in order, then columns.
+        """
+        lines = []
+        for direction, occupied in [[HORIZONTAL, self.rows], [VERTICAL, self.cols]]:
+            for lineIndex in sorted(occupied):
+                for start, line in self.segments(direction, lineIndex, reach):
+                    lines.append((direction, lineIndex, line, start))
+        return lines
@@ -0,0 +1,53 @@
+"""
+Description: Shared fixtures of the tests. The modules of the game are imported from the parent directory.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+
+@pytest.fixture(scope="session")
+def scrabbleEngine():
+    """
+    Engine of the "dawg" generator, shared by every test.
+    """
+    return engine.Engine()
+
+def shuffledTiles(scrabbleEngine, seed):
+    """
+    :returns the tiles of the engine in a random order given by the seed.
+    """
+    tiles = scrabbleEngine.tiles.copy()
+    random.Random(seed).shuffle(tiles)
+    return tiles
+
+def getState(game):
+    """
+    :returns everything a move changes in a game, as values that can be compared.
+    """
+    return {"board": [list(row) for row in game.board],
+            "positions": {letter: set(positions)
+                          for letter, positions in game.boardIndex.positions.items() if positions},
+            "rowMasks": list(game.boardIndex.rowMasks), "colMasks": list(game.boardIndex.colMasks),
+            "indexOccupied": game.boardIndex.occupied, "occupiedTiles": game.occupiedTiles,
+            "currentTiles": list(game.currentTiles), "usedTiles": game.usedTiles, "move": game.move,
+            "totalScore": game.totalScore, "moveScore": game.moveScore}
+
+def playBestMove(game):
+    """
+    Plays the best move of the game and ends the turn.
+
+    :returns the Placement made, None if there is no move.
+    """
+    [word, score, location] = game.getCurrentBest()
+    if word is None:
+        return None
+    game.locationIsValid(location, word)
+    game.endTurn()
+    return game.moveLog[-1]
@@ -0,0 +1,64 @@
+"""
+Description: Placements and their undo log: undoing moves restores the board, its index and the hand exactly,
+and a placement breaking the rules leaves the game unchanged, on every board backend. A word only counts a
+board tile once for its letters.
+"""
+
+import collections
+
+import pytest
+
+import conftest
+import engine
+import exception
+
+@pytest.mark.parametrize("backend", engine.BACKENDS)
+def testUndoRestoresEveryPosition(scrabbleEngine, backend):
+    game = scrabbleEngine.newGame(9, conftest.shuffledTiles(scrabbleEngine, 5), backend=backend)
+    game.getCurrentTiles()
+    states = [conftest.getState(game)]
+    for _ in range(12):
+        if conftest.playBestMove(game) is None:
+            break
+        states.append(conftest.getState(game))
+    assert len(states) > 5
+
+    for state in reversed(states[:-1]):
+        assert game.undoMove() is not None
+        assert conftest.getState(game) == state
+    assert game.undoMove() is None
+
+@pytest.mark.parametrize("backend", engine.BACKENDS)
+def testIllegalPlacementChangesNothing(scrabbleEngine, backend):
+    game = scrabbleEngine.newGame(9, conftest.shuffledTiles(scrabbleEngine, 6), backend=backend)
+    game.getCurrentTiles()
+    placement = conftest.playBestMove(game)
+    state = conftest.getState(game)
+    row, col = placement.row + 1, placement.col + 1
+
+    # Overwrites the first letter of the last word
+    overwrite = "Z" if placement.word[0] != "Z" else "Q"
+    game.currentTiles[0] = overwrite
+    state["currentTiles"][0] = overwrite
+    with pytest.raises(exception.TilesError):
+        game.placeTilesOnBoard([row, col, placement.direction], overwrite + placement.word[1:])
+    assert conftest.getState(game) == state
+
+    # Uses no existing tile, along an empty row
+    word = next(iter(scrabbleEngine.dictionary.candidates(collections.Counter(game.currentTiles), 9, 2)))
+    emptyRow = game.boardIndex.rowMasks.index(0)
+    with pytest.raises(exception.TilesError):
+        game.placeTilesOnBoard([emptyRow + 1, 1, "H"], word)
+    assert conftest.getState(game) == state
+
+def testRepeatedLetterNeedsAsManyTiles(scrabbleEngine):
+    game = scrabbleEngine.newGame(7)
+    game.currentTiles = list("ZIDAAAA")
+    game.move = 2
+    game.setTile(3, 1, "O")
+    game.occupiedTiles += 1
+    assert not game.wordIsValid("ZOOID")
+    game.setTile(3, 2, "O")
+    game.occupiedTiles += 1
+    assert game.wordIsValid("ZOOID")
+    assert ("ZOOID", "4:1:H") in [(move.word, move.location()) for move in game.iterMoves()]
@@ -0,0 +1,78 @@
+"""
+Description: The compiled lexicon answers like the text one, the letter-count signatures keep exactly the
+words the available letters can make, the candidate cache answers every word length of a rack from one entry,
+and the lexicon published in shared memory, with the base scores of its words, outlives the processes
+attached to it.
+"""
+
+import collections
+import random
+import subprocess
+import sys
+
+import pytest
+
+import engine
+import lexicon
+
+@pytest.fixture(scope="module")
+def textLexicon(scrabbleEngine):
+    return lexicon.Lexicon(lexicon.readWords(scrabbleEngine.dictionaryPath))
+
+def testPackedLexiconMatchesText(scrabbleEngine, textLexicon):
+    packed = scrabbleEngine.dictionary
+    assert isinstance(packed, lexicon.PackedLexicon)
+    assert list(packed.words) == textLexicon.words
+    rng = random.Random(1)
+    words = rng.sample(textLexicon.words, 2000)
+    probes = words + [word[:-1] for word in words] + [word + "S" for word in words] + ["", "QZX", "é", "hello"]
+    for word in probes:
+        assert (word in packed) == (word in textLexicon), word
+
+def canBeMade(word, available, extra):
+    """
+    :returns True if the word uses at most extra letters beyond the available ones.
+    """
+    return sum(max(0, count - available[letter]) for letter, count in collections.Counter(word).items()) <= extra
+
+@pytest.mark.parametrize("extra", [0, 1, 2])
+def testCandidatesMatchLetterCounts(scrabbleEngine, textLexicon, extra):
+    rng = random.Random(extra)
+    words = list(textLexicon.wordsWithinLength(8))
+    # Racks with many copies of a letter check that no letter borrows from its neighbour
+    racks = ["".join(rng.choice(lexicon.ALPHABET) for _ in range(7)) for _ in range(10)] + \
+        ["EEEEEEEEEEEEEEE", "ZZZZZZZAAAAAAAA", "QU", ""]
+    for rack in racks:
+        available = collections.Counter(rack)
+        expected = [word for word in words if canBeMade(word, available, extra)]
+        assert list(textLexicon.candidates(available, 8, extra=extra)) == expected
+        assert list(scrabbleEngine.dictionary.candidates(available, 8, extra=extra)) == expected
+
+def testCandidateCacheFiltersRacksByLength(scrabbleEngine):
+    cache = lexicon.CandidateCache(scrabbleEngine.dictionary)
+    available = collections.Counter("RETAINS")
+    # Every length and order of the tiles is answered from the entry filled by the first lookup
+    for maxLength in [7, 3, 5]:
+        for extra in [0, 2]:
+            expected = list(scrabbleEngine.dictionary.candidateIndexes(available, maxLength, extra=extra))
+            assert list(cache.candidateIndexes("NASTIER", maxLength, extra)) == expected
+    assert cache.misses == 2 and cache.hits == 4
+
+def testSharedLexiconOutlivesAttachedProcess(scrabbleEngine):
+    publisher = engine.Engine(scrabbleEngine.dictionaryPath)
+    name = publisher.shareLexicon()
+    try:
+        # The attached process takes the base scores published with the lexicon instead of adding them up
+        code = "import sys; sys.path[:0] = " + repr(sys.path) + "\nimport engine\n" + \
+            "attached = engine.Engine(sharedLexicon=" + repr(name) + ")\n" + \
+            "print('QUIZ' in attached.dictionary, attached.getBaseScores() is attached.dictionary.baseScores)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+        assert result.stdout.split() == ["True", "True"]
+        assert result.stderr == ""
+
+        attached = engine.Engine(scrabbleEngine.dictionaryPath, sharedLexicon=name)
+        assert "QUIZ" in attached.dictionary
+        assert list(attached.getBaseScores()) == list(scrabbleEngine.getBaseScores())
+        attached.close()
+    finally:
+        publisher.close()
@@ -0,0 +1,147 @@
+"""
+Description: The move generators find the same moves: the DAWG walk against every placement of every word
+the letters in play can make, the DAWG walk through its line cache for any rack it holds, and the word by word
+scan with and without its slot index, on the benchmark fixtures and along played games, on the list and sparse
+boards. The best moves of many racks evaluated at once are those of the racks one by one.
+"""
+
+import collections
+
+import pytest
+
+import benchmark
+import conftest
+import movegen
+
+def getMoves(moves):
+    return sorted(moves, key=movegen.moveKey)
+
+def getPlacedMoves(game, scrabbleEngine):
+    """
+    :returns the moves found by trying every word the tiles and the board letters can make at every position.
+    """
+    available = collections.Counter(game.currentTiles)
+    for row in game.board:
+        available.update(letter for letter in row if letter)
+    rack = movegen.rackTable(game.currentTiles)
+    scores = movegen.scoreTable(scrabbleEngine.scores)
+    moves = []
+    for word in scrabbleEngine.dictionary.candidates(available, len(game.board), 2):
+        for row in range(len(game.board)):
+            for col in range(len(game.board)):
+                for direction in [movegen.HORIZONTAL, movegen.VERTICAL]:
+                    score = movegen.getPlacementScore(game.board, word, row, col, direction, rack, scores)
+                    if score is not None:
+                        moves.append(movegen.Move(word, row, col, direction, score))
+    return getMoves(moves)
+
+def getWalkedMoves(game, scrabbleEngine):
+    return getMoves(movegen.generateMoves(game.board, game.currentTiles, game.isFirstMove(),
+                                          scrabbleEngine.getDawg(), scrabbleEngine.scores, game.boardIndex))
+
+def getScanMoves(game, scrabbleEngine, slots=False):
+    return getMoves(movegen.scanMoves(game.board, game.currentTiles, game.isFirstMove(), scrabbleEngine.dictionary,
+                                      scrabbleEngine.scores, game.boardIndex,
+                                      slotIndex=game.slotIndex if slots else None))
+
+@pytest.mark.parametrize("fill", list(benchmark.FIXTURE_FILLS))
+def testDawgMatchesEveryPlacement(scrabbleEngine, fill):
+    game = benchmark.loadFixture(scrabbleEngine, benchmark.fixturePath(5, fill))
+    walked = getWalkedMoves(game, scrabbleEngine)
+    assert walked
+    assert walked == getPlacedMoves(game, scrabbleEngine)
+
+def testDawgMatchesEveryPlacementAlongGame(scrabbleEngine):
+    game = scrabbleEngine.newGame(6, conftest.shuffledTiles(scrabbleEngine, 9))
+    game.getCurrentTiles()
+    conftest.playBestMove(game)
+    for _ in range(6):
+        moves = getWalkedMoves(game, scrabbleEngine)
+        assert moves == getPlacedMoves(game, scrabbleEngine)
+        if not moves:
+            break
+        conftest.playBestMove(game)
+
+# The scan without a slot index tries every letter position, which is slow on crowded boards
+@pytest.mark.parametrize("boardSize", [5, 10])
+@pytest.mark.parametrize("fill", list(benchmark.FIXTURE_FILLS))
+def testScanMatchesDawg(scrabbleEngine, boardSize, fill):
+    game = benchmark.loadFixture(scrabbleEngine, benchmark.fixturePath(boardSize, fill))
+    assert getScanMoves(game, scrabbleEngine) == getWalkedMoves(game, scrabbleEngine)
+
+@pytest.mark.parametrize("seed", [1, 2])
+def testCachedMovesMatchAlongGames(scrabbleEngine, seed):
+    game = scrabbleEngine.newGame(9, conftest.shuffledTiles(scrabbleEngine, seed))
+    game.getCurrentTiles()
+    for turn in range(16):
+        moves = getMoves(game.iterMoves())
+        assert moves == getWalkedMoves(game, scrabbleEngine)
+        if not moves:
+            break
+        conftest.playBestMove(game)
+        # Undone moves change the lines the cache has to walk again
+        if turn % 4 == 3:
+            game.undoMove()
+            game.undoMove()
+            game.getCurrentTiles()
+
+def testCachedLinesServeSmallerRacks(scrabbleEngine):
+    game = benchmark.loadFixture(scrabbleEngine, benchmark.fixturePath(10, "medium"))
+    getMoves(game.iterMoves())
+    misses = game.hintCache.misses
+    # Racks holding tiles of a rack walked before are answered without walking the lines again
+    for tiles in [game.currentTiles[1:], game.currentTiles[::2], game.currentTiles[-1:]]:
+        game.currentTiles = list(tiles)
+        assert getMoves(game.iterMoves()) == getWalkedMoves(game, scrabbleEngine)
+    assert game.hintCache.misses == misses
+
+@pytest.mark.parametrize("boardSize", benchmark.FIXTURE_SIZES)
+@pytest.mark.parametrize("fill", list(benchmark.FIXTURE_FILLS))
+def testSlotScanMatchesDawg(scrabbleEngine, boardSize, fill):
+    game = benchmark.loadFixture(scrabbleEngine, benchmark.fixturePath(boardSize, fill))
+    assert getScanMoves(game, scrabbleEngine, slots=True) == getWalkedMoves(game, scrabbleEngine)
+
+@pytest.mark.parametrize("seed", [1, 2])
+def testSlotScanMatchesDawgAlongGames(scrabbleEngine, seed):
+    game = scrabbleEngine.newGame(9, conftest.shuffledTiles(scrabbleEngine, seed))
+    game.getCurrentTiles()
+    for turn in range(16):
+        moves = getWalkedMoves(game, scrabbleEngine)
+        assert getScanMoves(game, scrabbleEngine, slots=True) == moves
+        if not moves:
+            break
+        conftest.playBestMove(game)
+        # Undone moves open slots again, which the index has to find
+        if turn % 4 == 3:
+            game.undoMove()
+            game.undoMove()
+            game.getCurrentTiles()
+
+def testSparseBoardMatchesListBoard(scrabbleEngine):
+    tiles = conftest.shuffledTiles(scrabbleEngine, 3)
+    games = [scrabbleEngine.newGame(12, tiles), scrabbleEngine.newGame(12, tiles, backend="sparse")]
+    for game in games:
+        game.getCurrentTiles()
+    for turn in range(10):
+        listMoves, sparseMoves = [getMoves(game.iterMoves()) for game in games]
+        assert sparseMoves == listMoves
+        if not listMoves:
+            break
+        for game in games:
+            conftest.playBestMove(game)
+
+def testBatchMatchesCurrentBest(scrabbleEngine):
+    game = benchmark.loadFixture(scrabbleEngine, benchmark.fixturePath(10, "medium"))
+    racks = [conftest.shuffledTiles(scrabbleEngine, seed)[:7] for seed in range(20)] + [["Q", "Z"], list("EEEEEEE")]
+    expected = []
+    for rack in racks:
+        game.currentTiles = list(rack)
+        expected.append(game.getCurrentBest())
+    assert game.getBatchBest(racks) == expected
+
+def testFirstMoveStartsAtFirstCell(scrabbleEngine):
+    game = scrabbleEngine.newGame(7, conftest.shuffledTiles(scrabbleEngine, 4))
+    game.getCurrentTiles()
+    moves = list(game.iterMoves())
+    assert moves
+    assert {(move.row, move.col, move.direction) for move in moves} == {(0, 0, movegen.HORIZONTAL)}
@@ -0,0 +1,57 @@
+"""
+Description: Snapshots and move logs give back the games they were written from.
+"""
+
+import pytest
+
+import conftest
+import savegame
+
+def playGame(scrabbleEngine, backend="list", moves=10):
+    game = scrabbleEngine.newGame(11, conftest.shuffledTiles(scrabbleEngine, 7), backend=backend)
+    game.getCurrentTiles()
+    for _ in range(moves):
+        if conftest.playBestMove(game) is None:
+            break
+    return game
+
+@pytest.mark.parametrize("backend", ["list", "sparse"])
+def testSnapshotRoundTrip(scrabbleEngine, backend):
+    game = playGame(scrabbleEngine, backend)
+    restored = savegame.loadSnapshot(scrabbleEngine, savegame.saveSnapshot(game), backend)
+    assert conftest.getState(restored) == conftest.getState(game)
+    assert restored.tiles == game.tiles
+    # The restored game goes on with the same moves
+    assert restored.getCurrentBest() == game.getCurrentBest()
+
+def testSnapshotRejectsOtherData(scrabbleEngine):
+    data = savegame.saveSnapshot(playGame(scrabbleEngine, moves=2))
+    with pytest.raises(ValueError):
+        savegame.loadSnapshot(scrabbleEngine, data[:-1])
+    with pytest.raises(ValueError):
+        savegame.loadSnapshot(scrabbleEngine, b"NOTASNAP" + data[8:])
+
+def testMoveLogReplaysEveryPosition(scrabbleEngine, tmp_path):
+    path = str(tmp_path / "game.log")
+    game = scrabbleEngine.newGame(11, conftest.shuffledTiles(scrabbleEngine, 8))
+    game.getCurrentTiles()
+    states = [conftest.getState(game)]
+    with savegame.MoveLog(path, game) as moveLog:
+        for _ in range(8):
+            placement = conftest.playBestMove(game)
+            if placement is None:
+                break
+            moveLog.append(placement)
+            states.append(conftest.getState(game))
+
+    for count, state in enumerate(states):
+        assert conftest.getState(savegame.replay(scrabbleEngine, path, count)) == state
+
+    # A move cut short is dropped, and a resumed log appends after the last whole move
+    with open(path, "ab") as logFile:
+        logFile.write(b"\x01\x02")
+    assert len(savegame.readMoveLog(path)[1]) == len(states) - 1
+    resumed = savegame.replay(scrabbleEngine, path)
+    with savegame.MoveLog(path) as moveLog:
+        moveLog.append(conftest.playBestMove(resumed))
+    assert conftest.getState(savegame.replay(scrabbleEngine, path)) == conftest.getState(resumed)
@@ -0,0 +1,50 @@
+"""
+Description: A session of server.Client against a GameServer computing its hints in a thread, including
+requests with numbers out of range.
+"""
+
+import asyncio
+
+import server
+
+async def playSession(scrabbleEngine):
+    gameServer = server.GameServer(scrabbleEngine, workers=0)
+    listener = await gameServer.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    client = await server.Client().connect(port=port)
+    try:
+        response = await client.send("hint")
+        assert not response["ok"]
+
+        # Numbers too large for a float are rejected without closing the connection
+        for fields in [{"size": 1e400}, {"size": -1e400}, {"size": "nan"}]:
+            response = await client.send("new", **fields)
+            assert not response["ok"] and response["error"]
+
+        response = await client.send("new", size=7)
+        assert response["ok"] and response["move"] == 1 and len(response["tiles"]) == 7
+        assert response["board"] == ["......."] * 7
+
+        hint = await client.send("hint")
+        assert hint["ok"] and hint["word"] is not None
+        response = await client.send("top", count=1e400)
+        assert not response["ok"] and response["error"]
+        top = await client.send("top", count=3)
+        assert top["ok"] and top["moves"][0] == [hint["word"], hint["score"], hint["location"]]
+
+        response = await client.send("play", word=hint["word"], location=hint["location"])
+        assert response["ok"] and response["move"] == 2 and response["totalScore"] == hint["score"]
+        assert response["board"][0].startswith(hint["word"])
+
+        response = await client.send("play", word="QQQQ", location="1:1:H")
+        assert not response["ok"] and response["error"]
+        response = await client.send("state")
+        assert response["ok"] and response["totalScore"] == hint["score"]
+    finally:
+        await client.close()
+        listener.close()
+        await listener.wait_closed()
+        gameServer.close()
+
+def testClientSession(scrabbleEngine):
+    asyncio.run(playSession(scrabbleEngine))